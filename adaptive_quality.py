@@ -0,0 +1,63 @@
+class AdaptiveQualityController:
+    """Pick inference stride and resize width so per-frame work stays inside a time budget
+
+    Over budget: shrink the frame first, then skip more frames.
+    Well under budget: process more frames first, then grow the frame back.
+    Hands present and moving fast: jump straight back to full quality.
+    """
+
+    def __init__(self, latency_budget=None, target_fps=15, max_width=640, min_width=320,
+                 width_step=64, max_stride=4, motion_threshold=0.03, smoothing=0.2, cooldown_frames=10):
+        # Budget per frame in seconds (latency_budget wins over target_fps)
+        self.budget = latency_budget if latency_budget else 1.0 / target_fps
+        self.max_width = max_width
+        self.min_width = min_width
+        self.width_step = width_step
+        self.max_stride = max_stride
+        self.motion_threshold = motion_threshold  # Hand motion per frame, fraction of frame width
+        self.smoothing = smoothing
+        self.cooldown_frames = cooldown_frames  # Frames to wait between adjustments
+
+        self.width = max_width
+        self.stride = 1
+        self.avg_frame_time = 0.0
+        self.frames_since_change = 0
+
+    def update(self, frame_time, hand_count=0, motion=0.0):
+        """Feed one frame's processing time, returns (stride, width) to use next"""
+        if self.avg_frame_time == 0.0:
+            self.avg_frame_time = frame_time
+        else:
+            self.avg_frame_time += self.smoothing * (frame_time - self.avg_frame_time)
+        self.frames_since_change += 1
+
+        # Gestures in progress: full quality, whatever it costs
+        if hand_count > 0 and motion >= self.motion_threshold:
+            if self.stride != 1 or self.width != self.max_width:
+                self.stride, self.width = 1, self.max_width
+                self.frames_since_change = 0
+            return self.stride, self.width
+
+        if self.frames_since_change < self.cooldown_frames:
+            return self.stride, self.width
+
+        # Average includes the cheap skipped frames, so it tracks the real per-frame cost
+        if self.avg_frame_time > self.budget * 1.1:
+            if self.width > self.min_width:
+                self.width = max(self.min_width, self.width - self.width_step)
+            elif self.stride < self.max_stride:
+                self.stride += 1
+            else:
+                return self.stride, self.width
+            self.frames_since_change = 0
+
+        elif self.avg_frame_time < self.budget * 0.6:
+            if self.stride > 1:
+                self.stride -= 1
+            elif self.width < self.max_width:
+                self.width = min(self.max_width, self.width + self.width_step)
+            else:
+                return self.stride, self.width
+            self.frames_since_change = 0
+
+        return self.stride, self.width
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 import sys
-import time
 
 # Check for naming conflicts and import pyserial
 try:
@@ -17,59 +16,39 @@ except ImportError as e:
     print("2. Check if you have a file named 'serial.py' in your directory and rename it")
     print("3. Try: pip uninstall serial pyserial && pip install pyserial")
     sys.exit(1)
+from serial_worker import SerialWorker
+from arduino_discovery import discover_arduino
     
 
 def find_arduino_port():
-    """Try to find Arduino port automatically on Linux"""
-    import glob
-    possible_ports = glob.glob('/dev/ttyUSB*') + glob.glob('/dev/ttyACM*')
-    
-    for port in possible_ports:
-        try:
-            test_connection = serial.Serial(port, 9600, timeout=1)
-            test_connection.close()
-            return port
-        except:
-            continue
-    return None
+    """Find the port whose sketch answers the identity handshake (remembered port first, then all at once)"""
+    port, connection = discover_arduino()
+    if connection is not None:
+        connection.close()
+    return port
 
 def setup_arduino_connection(port=None, baud_rate=9600):
-    """Set up serial connection to Arduino"""
-    if port is None:
-        port = find_arduino_port()
-        if port is None:
-            print("No Arduino found. Please specify port manually.")
-            return None
-    
-    try:
-        arduino = serial.Serial(port, baud_rate, timeout=1)
-        time.sleep(2)  # Wait for Arduino to initialize
-        print(f"Connected to Arduino on {port}")
+    """Set up serial connection to Arduino (port=None finds it and keeps the probed connection open)"""
+    # Serial I/O runs on the worker's threads; replies are printed as they arrive
+    arduino = SerialWorker(port, baud_rate, binary=False).start()
+    arduino.on_line(lambda line: print(f"Arduino response: {line}"))
+    if arduino.wait_connected():
         return arduino
-    except Exception as e:
-        print(f"Error connecting to Arduino on {port}: {e}")
-        print("Available ports:")
-        import glob
-        ports = glob.glob('/dev/ttyUSB*') + glob.glob('/dev/ttyACM*')
-        for p in ports:
-            print(f"  {p}")
-        return None
+    arduino.close()
+    
+    print(f"Error connecting to Arduino on {port or 'any port'}")
+    print("Available ports:")
+    import glob
+    ports = glob.glob('/dev/ttyUSB*') + glob.glob('/dev/ttyACM*')
+    for p in ports:
+        print(f"  {p}")
+    return None
 
 def send_command(arduino, command):
-    """Send command (1 or 2) to Arduino"""
-    if arduino and arduino.is_open:
-        arduino.write(str(command).encode())
+    """Send command (1 or 2) to Arduino, returns immediately (the reply is printed when it arrives)"""
+    if arduino and arduino.connected.is_set():
+        arduino.send(command)
         print(f"Sent: {command}")
-        
-        # Optional: Read response from Arduino
-        try:
-            time.sleep(0.1)  # Give Arduino time to respond
-            if arduino.in_waiting > 0:
-                response = arduino.readline().decode().strip()
-                if response:
-                    print(f"Arduino response: {response}")
-        except Exception as e:
-            print(f"Error reading response: {e}")
     else:
         print("Arduino not connected")
 
@@ -103,12 +82,10 @@ def main():
                 else:
                     print("Please enter only 1, 2, or q")
                 
-                time.sleep(0.1)
-                
         except KeyboardInterrupt:
             print("\nExiting...")
         finally:
-            if arduino and arduino.is_open:
+            if arduino:
                 arduino.close()
             print("Connection closed")
     else:
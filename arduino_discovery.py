@@ -0,0 +1,142 @@
+import os
+import json
+import glob
+import time
+import concurrent.futures
+import serial
+from serial.tools import list_ports
+from oled_protocol import FrameDecoder, identify_frame, RSP_IDENTITY, DEVICE_ID, DEFAULT_BAUD
+
+CACHE_PATH = "arduino_port.json"
+READY_BANNER = "Ready"  # Last line of setup() in oled2.ino
+BOOT_TIMEOUT = 3.0  # Opening the port resets the board; setup() takes about 1.5 s
+
+
+def wait_for_banner(connection, timeout=BOOT_TIMEOUT):
+    """Read until the sketch prints its ready banner, True if it did before the timeout"""
+    deadline = time.time() + timeout
+    decoder = FrameDecoder()
+    while time.time() < deadline:
+        data = connection.read(connection.in_waiting or 1)
+        for item in decoder.feed(data):
+            if item == READY_BANNER:
+                return True
+    return False
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(port, serial_number, path=CACHE_PATH):
+    try:
+        with open(path, "w") as f:
+            json.dump({"port": port, "serial_number": serial_number, "found": time.time()}, f)
+    except OSError as e:
+        print(f"⚠️  Could not cache Arduino port: {e}")
+
+
+def port_preference(device, serial_number, cache):
+    """0 the cached board (even if renumbered), 1 ARDUINO_PORT, 2 the cached path, 3 anything else"""
+    if cache.get("serial_number") and serial_number == cache["serial_number"]:
+        return 0
+    if device == os.environ.get("ARDUINO_PORT"):
+        return 1
+    if device == cache.get("port"):
+        return 2
+    return 3
+
+
+def candidate_ports(cache=None):
+    """(port, serial number) pairs to probe, most likely first (see port_preference)"""
+    cache = cache or {}
+    ports = {}
+    for info in list_ports.comports():
+        if "ttyACM" in info.device or "ttyUSB" in info.device or info.device.startswith("COM"):
+            ports[info.device] = info.serial_number
+    for device in glob.glob("/dev/ttyACM*") + glob.glob("/dev/ttyUSB*"):
+        ports.setdefault(device, None)
+    if os.environ.get("ARDUINO_PORT"):
+        ports.setdefault(os.environ["ARDUINO_PORT"], None)
+    return [(device, ports[device])
+            for device in sorted(ports, key=lambda device: port_preference(device, ports[device], cache))]
+
+
+def probe(port, baud=DEFAULT_BAUD, boot_timeout=BOOT_TIMEOUT, reply_timeout=0.5):
+    """Open a port and ask for the sketch's identity; returns the open connection or None"""
+    try:
+        connection = serial.Serial(port, baud, timeout=0.05)
+    except (serial.SerialException, OSError):
+        return None
+    try:
+        wait_for_banner(connection, boot_timeout)  # Sketches without a banner just take the full timeout
+        connection.reset_input_buffer()
+        connection.write(identify_frame())
+        decoder = FrameDecoder()
+        deadline = time.time() + reply_timeout
+        while time.time() < deadline:
+            for item in decoder.feed(connection.read(connection.in_waiting or 1)):
+                if not isinstance(item, str) and item.command == RSP_IDENTITY and item.payload.startswith(DEVICE_ID):
+                    return connection
+    except (serial.SerialException, OSError):
+        pass
+    connection.close()
+    return None
+
+
+def discover_arduino(baud=DEFAULT_BAUD, boot_timeout=BOOT_TIMEOUT, cache_path=CACHE_PATH):
+    """Find the board, returns (port, open connection) or (None, None)
+
+    The remembered board (USB serial number or path, or ARDUINO_PORT) is tried on its
+    own first, so other ports are not opened (which resets them). Otherwise all ports
+    are probed at once and the first whose sketch answers the identity handshake wins;
+    it is remembered for the next boot.
+    """
+    start = time.time()
+    cache = load_cache(cache_path)
+    candidates = candidate_ports(cache)
+    if not candidates:
+        print("❌ No serial ports found")
+        return None, None
+
+    port, serial_number = candidates[0]
+    if port_preference(port, serial_number, cache) < 3:
+        connection = probe(port, baud, boot_timeout)
+        if connection is not None:
+            save_cache(port, serial_number, cache_path)
+            print(f"🔌 Found Arduino on {port} (remembered) in {time.time() - start:.2f}s")
+            return port, connection
+        candidates = candidates[1:]
+        if not candidates:
+            print(f"❌ No Arduino answered on {port}")
+            return None, None
+
+    found_port, found_connection = None, None
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(candidates))
+    futures = {executor.submit(probe, port, baud, boot_timeout): (port, serial_number)
+               for port, serial_number in candidates}
+    for future in concurrent.futures.as_completed(futures):
+        connection = future.result()
+        if connection is not None:
+            found_port, found_connection = futures[future][0], connection
+            save_cache(found_port, futures[future][1], cache_path)
+            break
+    def close_extra(future):
+        connection = future.result()
+        if connection is not None and connection is not found_connection:
+            connection.close()
+
+    # Do not wait for slower ports; anything else that answers is closed again
+    for future in futures:
+        future.add_done_callback(close_extra)
+    executor.shutdown(wait=False)
+
+    if found_port:
+        print(f"🔌 Found Arduino on {found_port} in {time.time() - start:.2f}s")
+    else:
+        print(f"❌ No Arduino answered on {', '.join(port for port, _ in candidates)}")
+    return found_port, found_connection
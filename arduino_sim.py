@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""Pseudo-terminal Arduino that behaves like oled2.ino, for testing without a board.
+
+It speaks both the framed protocol (oled_protocol.py) and the old text digits, stays busy
+for as long as each animation would take, paces bytes like a real UART and only keeps
+what fits in the 64-byte receive buffer while animating.
+
+    python arduino_sim.py                        # run one, point ARDUINO_PORT at the printed port
+    python arduino_sim.py --bench --time-scale 0.05 --output sim_latency.json
+"""
+
+import os
+import tty
+import json
+import time
+import select
+import argparse
+import platform
+import threading
+from oled_protocol import (FRAME_START, MAX_PAYLOAD, CMD_EMOTION, CMD_SET_BAUD, CMD_PING, CMD_IDENTIFY, RSP_ACK,
+                           RSP_READY, RSP_BAUD_OK, RSP_IDENTITY, RSP_ERROR, DEVICE_ID, DEFAULT_BAUD, FAST_BAUD,
+                           BAUD_CONFIRM_MS, encode_frame)
+
+# Pauses (ms) per repeat and default repeat count of each animation in oled2.ino
+ANIMATIONS = {
+    "blink": ([800, 200], 3),
+    "wave": ([300, 300], 3),
+    "blast": ([300, 200, 200, 400, 600, 300], 2),
+    "emo_gun": ([1500, 800, 2000], 3),
+}
+# playEmotion(): anything not listed falls back to blink
+EMOTION_ANIMATIONS = {1: "blink", 2: "wave", 4: "blast"}
+EMOTION_NAMES = {1: "Blink", 2: "Happy", 3: "Suspect", 4: "Angry", 5: "Dizzy"}
+
+SETUP_MS = 1000  # delay() at the end of setup()
+RESTING_MS = 1000  # restingFace(): every emotion ends with one more blink and a 1 s wait
+RX_BUFFER = 63  # Bytes the AVR core keeps while loop() is not reading
+FIRMWARE_VERSION = 1
+
+
+def animation_seconds(name, speed=100, loops=0):
+    pauses, default_loops = ANIMATIONS[name]
+    return sum(pauses) * (loops or default_loops) * 100.0 / max(speed, 1) / 1000.0
+
+
+class ArduinoSimulator:
+    """oled2.ino on a pty: open `port` with pyserial like a real /dev/ttyACM device
+
+    time_scale shrinks animation and boot delays (0.05 = 20x faster) while byte pacing
+    stays real, so transport latency can be measured quickly. Every command is logged
+    with its receive time and when its animation started and finished.
+    """
+
+    def __init__(self, baud=DEFAULT_BAUD, time_scale=1.0, on_display=None):
+        self.baud = baud
+        self.time_scale = time_scale
+        self.on_display = on_display  # on_display(emotion, animation) when the face changes
+        self.master = None
+        self.slave = None
+        self.port = None
+        self.thread = None
+        self.running = False
+        self.log = []  # {"command", "emotion", "animation", "received", "started", "finished"}
+        self.overflowed = 0  # Bytes lost while busy
+        self.parse_state = "start"
+        self.frame = bytearray()
+        self.baud_deadline = None
+
+    def start(self):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="arduino-sim", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        for fd in (self.master, self.slave):
+            if fd is not None:
+                os.close(fd)
+        self.master = self.slave = None
+
+    def byte_time(self):
+        return 10.0 / self.baud  # Start bit + 8 data bits + stop bit
+
+    def sleep(self, seconds):
+        time.sleep(seconds * self.time_scale)
+
+    def write(self, data):
+        time.sleep(len(data) * self.byte_time())  # Serial.write blocks once its TX buffer is full
+        os.write(self.master, data)
+
+    def println(self, text):
+        self.write(f"{text}\r\n".encode())
+
+    def read_available(self, timeout):
+        ready, _, _ = select.select([self.master], [], [], timeout)
+        if not ready:
+            return b""
+        try:
+            return os.read(self.master, 256)
+        except OSError:
+            return b""
+
+    def run(self):
+        self.sleep(SETUP_MS / 1000.0)
+        self.println("Ready")
+        pending = b""
+        while self.running:
+            data = pending or self.read_available(0.05)
+            pending = b""
+            if self.baud_deadline and time.time() > self.baud_deadline:
+                self.baud, self.baud_deadline = DEFAULT_BAUD, None
+            for index, byte in enumerate(data):
+                time.sleep(self.byte_time())
+                if self.handle_byte(byte):
+                    # Busy animating: only what fits in the receive buffer survives
+                    rest = data[index + 1:] + self.drain()
+                    pending = rest[:RX_BUFFER]
+                    self.overflowed += max(0, len(rest) - RX_BUFFER)
+                    break
+
+    def drain(self):
+        data = b""
+        while True:
+            chunk = self.read_available(0)
+            if not chunk:
+                return data
+            data += chunk
+
+    def handle_byte(self, byte):
+        """Mirror of loop()/parseByte(), returns True if an animation was played"""
+        if self.parse_state == "start":
+            if ord("1") <= byte <= ord("9"):
+                self.text_command(byte - ord("0"))
+                return True
+            if byte == FRAME_START:
+                self.frame = bytearray()
+                self.parse_state = "frame"
+            return False
+
+        self.frame.append(byte)
+        if len(self.frame) >= 2 and self.frame[1] > MAX_PAYLOAD:
+            self.parse_state = "start"
+            return False
+        if len(self.frame) < 2 or len(self.frame) < 3 + self.frame[1]:
+            return False
+        self.parse_state = "start"
+        command, length = self.frame[0], self.frame[1]
+        payload = bytes(self.frame[2:2 + length])
+        check = command ^ length
+        for value in payload:
+            check ^= value
+        if check != self.frame[2 + length]:
+            return False
+        return self.handle_frame(command, payload)
+
+    def handle_frame(self, command, payload):
+        if command == CMD_EMOTION:
+            received = time.time()
+            self.write(encode_frame(RSP_ACK, [CMD_EMOTION]))
+            emotion = payload[0] if payload else 1
+            speed = payload[1] if len(payload) > 1 and payload[1] else 100
+            loops = payload[2] if len(payload) > 2 else 0
+            self.play(f"frame {emotion}", emotion, speed, loops, received)
+            self.resting_face()
+            self.write(encode_frame(RSP_READY))
+            return True
+        if command == CMD_SET_BAUD and len(payload) == 4:
+            self.write(encode_frame(RSP_BAUD_OK, payload))
+            self.baud = int.from_bytes(payload, "little")
+            self.baud_deadline = time.time() + BAUD_CONFIRM_MS / 1000.0 if self.baud != DEFAULT_BAUD else None
+            return False
+        if command == CMD_PING:
+            self.baud_deadline = None
+            self.write(encode_frame(RSP_ACK, [CMD_PING]))
+            return False
+        if command == CMD_IDENTIFY:
+            self.write(encode_frame(RSP_IDENTITY, DEVICE_ID + bytes([FIRMWARE_VERSION])))
+            return False
+        self.write(encode_frame(RSP_ERROR, [command]))
+        return False
+
+    def text_command(self, emotion):
+        received = time.time()
+        self.println(f"Executing: {emotion}")
+        self.play(f"text {emotion}", emotion, received=received)
+        if emotion > 5:
+            self.println("Invalid command. Use 1-5")
+        self.resting_face()
+        self.println("Ready")
+
+    def resting_face(self):
+        self.sleep(animation_seconds("blink") + RESTING_MS / 1000.0)
+
+    def play(self, command, emotion, speed=100, loops=0, received=None):
+        animation = EMOTION_ANIMATIONS.get(emotion, "blink")
+        entry = {"command": command, "emotion": EMOTION_NAMES.get(emotion, str(emotion)),
+                 "animation": animation, "received": received or time.time()}
+        entry["started"] = time.time()  # First display.display() of the animation
+        self.log.append(entry)
+        if self.on_display:
+            self.on_display(emotion, animation)
+        self.sleep(animation_seconds(animation, speed, loops))
+        entry["finished"] = time.time()
+
+
+def wait_for(condition, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.0005)
+    return False
+
+
+def stats_ms(samples):
+    values = sorted(sample * 1000.0 for sample in samples)
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p99": 0.0}
+    return {
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(values[len(values) // 2], 3),
+        "p99": round(values[min(len(values) - 1, int(len(values) * 0.99))], 3),
+    }
+
+
+def bench_path(sim, worker, trigger, count, timeout):
+    """Latency from trigger() to the simulated face changing, one command at a time"""
+    latencies = []
+    for i in range(count):
+        seen = len(sim.log)
+        start = time.time()
+        trigger(i)
+        if not wait_for(lambda: len(sim.log) > seen, timeout):
+            continue
+        latencies.append(sim.log[seen]["started"] - start)
+        wait_for(lambda: "finished" in sim.log[-1] and worker.busy_since is None, timeout)
+    return {"samples": len(latencies), "latency_ms": stats_ms(latencies)}
+
+
+def bench_burst(sim, worker, size, timeout):
+    """A burst of emotions while the face is busy: how many reach the display"""
+    seen = len(sim.log)
+    coalesced = worker.coalesced
+    for i in range(size):
+        worker.send_emotion("2" if i % 2 else "4")
+    wait_for(lambda: worker.pending_emotion is None and worker.busy_since is None and len(sim.log) > seen, timeout)
+    return {"sent": size, "displayed": len(sim.log) - seen, "coalesced": worker.coalesced - coalesced}
+
+
+def run_bench(baud, fast_baud, binary, count, time_scale):
+    from serial_worker import SerialWorker
+    from gesture_events import GestureEventBus
+
+    sim = ArduinoSimulator(baud=baud, time_scale=time_scale).start()
+    worker = SerialWorker(sim.port, baud, boot_delay=SETUP_MS / 1000.0 * time_scale + 0.5,
+                          binary=binary, fast_baud=fast_baud if binary else None).start()
+    timeout = 30 * max(time_scale, 0.05) + 2
+    try:
+        if not worker.wait_connected(5):
+            raise RuntimeError(f"Could not open simulator port {sim.port}")
+
+        # Same wiring as helo.py: gesture event -> emotion -> serial worker
+        bus = GestureEventBus()
+        bus.subscribe(lambda event: worker.send_emotion("2" if event.kind == "wave" else "4"))
+        gesture = bench_path(sim, worker, lambda i: bus.publish("wave" if i % 2 else "gun", frame_seq=i),
+                             count, timeout)
+        bus.close()
+
+        # Speech path: emotion picked from the reply, sent from the conversation thread
+        speech = bench_path(sim, worker, lambda i: worker.send_emotion(str(1 + i % 5)), count, timeout)
+        burst = bench_burst(sim, worker, 10, timeout)
+        return {
+            "protocol": "binary" if binary else "text",
+            "baud": worker.serial.baudrate,
+            "gesture_to_emotion": gesture,
+            "speech_to_emotion": speech,
+            "burst": burst,
+            "rx_overflow_bytes": sim.overflowed,
+        }
+    finally:
+        worker.close()
+        sim.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulate the OLED Arduino on a pseudo-terminal")
+    parser.add_argument("--bench", action="store_true", help="Measure gesture/speech -> emotion latency")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUD)
+    parser.add_argument("--fast-baud", type=int, default=FAST_BAUD, help="Rate to negotiate (binary protocol)")
+    parser.add_argument("--text", action="store_true", help="Benchmark the old text protocol as well")
+    parser.add_argument("--count", type=int, default=20, help="Commands per path")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Animation/boot time multiplier")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    if not args.bench:
+        sim = ArduinoSimulator(baud=args.baud, time_scale=args.time_scale,
+                               on_display=lambda emotion, animation: print(f"🖥️  {EMOTION_NAMES.get(emotion, emotion)}: {animation}"))
+        sim.start()
+        print(f"🤖 Simulated Arduino on {sim.port} (ARDUINO_PORT={sim.port} python helo.py)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            sim.stop()
+        return
+
+    runs = [run_bench(args.baud, args.fast_baud, True, args.count, args.time_scale)]
+    if args.text:
+        runs.append(run_bench(args.baud, None, False, args.count, args.time_scale))
+    report = {
+        "benchmark": "arduino_latency",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "time_scale": args.time_scale,
+        "runs": runs,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"📊 Benchmark results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import threading
+from collections import deque
+import numpy as np
+import miniaudio  # pip install miniaudio
+import pyaudio
+
+SAMPLE_RATE = 24000  # edge-tts output rate, everything is resampled to this on decode
+CHANNELS = 1
+BLOCK_SIZE = 512  # Frames per output callback (~21 ms), also the worst-case stop latency
+
+
+class Playback:
+    """Handle for one queued sound: wait() until it finishes, stop() to cut it off"""
+
+    def __init__(self, samples, name):
+        self.samples = samples
+        self.name = name
+        self.position = 0
+        self.stopped = False
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def stop(self):
+        self.stopped = True
+        self.done.set()
+
+    @property
+    def finished(self):
+        return self.done.is_set()
+
+
+class AudioPlayer:
+    """In-process playback on one persistent output stream
+
+    Sounds are decoded to int16 PCM once (preloaded clips stay in memory). Each channel is a
+    queue played in order; all channels are mixed together, so an effect on "effects"
+    plays over the speech on "speech". Stopping takes effect on the next output block.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, channels=CHANNELS, block_size=BLOCK_SIZE):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_size = block_size
+        self.clips = {}  # path -> preloaded PCM
+        self.queues = {}  # channel -> deque of Playback
+        self.lock = threading.Lock()
+        self.pa = None
+        self.stream = None
+        self.underruns = 0
+        self.output_level = 0.0  # RMS of the last block written, used to gate the mic's echo
+
+    def start(self):
+        """Open the output stream (kept open and fed silence when idle)"""
+        if self.stream is not None:
+            return self
+        self.pa = pyaudio.PyAudio()
+        self.stream = self.pa.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            output=True,
+            frames_per_buffer=self.block_size,
+            stream_callback=self.fill_block,
+        )
+        self.stream.start_stream()
+        print(f"🔊 Audio output ready ({self.sample_rate} Hz, {self.block_size}-frame blocks)")
+        return self
+
+    def close(self):
+        self.stop()
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        if self.pa is not None:
+            self.pa.terminate()
+            self.pa = None
+
+    def decode(self, path):
+        """Decode an audio file to interleaved int16 PCM at the output format"""
+        decoded = miniaudio.decode_file(
+            path,
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=self.channels,
+            sample_rate=self.sample_rate,
+        )
+        return np.frombuffer(decoded.samples, dtype=np.int16).reshape(-1, self.channels)
+
+    def preload(self, path):
+        """Decode a short clip once and keep it in memory, later play(path) skips decoding"""
+        try:
+            self.clips[path] = self.decode(path)
+            return True
+        except (OSError, miniaudio.DecodeError) as e:
+            print(f"❌ Could not load {path}: {e}")
+            return False
+
+    def play(self, sound, channel="speech"):
+        """Queue a file path (preloaded or not) or a PCM array, returns its Playback"""
+        if isinstance(sound, np.ndarray):
+            samples, name = sound.reshape(-1, self.channels), "pcm"
+        elif sound in self.clips:
+            samples, name = self.clips[sound], sound
+        else:
+            samples, name = self.decode(sound), sound
+
+        playback = Playback(samples, name)
+        if self.stream is None:
+            self.start()
+        with self.lock:
+            self.queues.setdefault(channel, deque()).append(playback)
+        return playback
+
+    def stop(self, channel=None):
+        """Cut off the current sound and drop the queue of one channel (or all of them)"""
+        with self.lock:
+            channels = [channel] if channel else list(self.queues)
+            for name in channels:
+                queue = self.queues.get(name)
+                if not queue:
+                    continue
+                for playback in queue:
+                    playback.stop()
+                queue.clear()
+
+    def is_playing(self, channel=None):
+        with self.lock:
+            channels = [channel] if channel else list(self.queues)
+            return any(self.queues.get(name) for name in channels)
+
+    def fill_block(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: mix the head of every channel queue into one block"""
+        if status & pyaudio.paOutputUnderflow:
+            self.underruns += 1
+        mix = np.zeros((frame_count, self.channels), dtype=np.int32)
+        with self.lock:
+            for queue in self.queues.values():
+                filled = 0
+                while queue and filled < frame_count:
+                    playback = queue[0]
+                    if playback.stopped:
+                        queue.popleft()
+                        continue
+                    chunk = playback.samples[playback.position:playback.position + frame_count - filled]
+                    mix[filled:filled + len(chunk)] += chunk
+                    filled += len(chunk)
+                    playback.position += len(chunk)
+                    if playback.position >= len(playback.samples):
+                        queue.popleft()
+                        playback.done.set()
+        np.clip(mix, -32768, 32767, out=mix)
+        self.output_level = float(np.sqrt(np.mean(np.square(mix, dtype=np.float32))))
+        return mix.astype(np.int16).tobytes(), pyaudio.paContinue
+
+
+player = None
+player_lock = threading.Lock()
+
+
+def get_player():
+    """Shared AudioPlayer, started on first use"""
+    global player
+    if player is None:
+        with player_lock:
+            if player is None:
+                player = AudioPlayer().start()
+    return player
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Gesture pipeline benchmark: per-stage timings, throughput, latency and detection accuracy.
+
+MediaPipe is replaced by a fixture player that returns recorded (or synthetic) landmarks,
+so runs are deterministic and need no camera. Results are written as JSON.
+
+    python bench_gestures.py                               # synthetic scenarios
+    python bench_gestures.py --clip session.mp4 --fixture session.json
+    python bench_gestures.py --record session.mp4 session.json   # needs real MediaPipe
+    python bench_gestures.py --set wave_threshold=25 --output bench_output.txt
+"""
+
+import sys
+import ast
+import json
+import time
+import types
+import argparse
+import platform
+import numpy as np
+import cv2
+
+STAGES = ["decode", "resize", "color_convert", "inference", "gesture_logic", "overlay"]
+
+# Open palm, landmark offsets from the wrist in normalized image coordinates
+OPEN_HAND = np.array([
+    (0.0, 0.0),
+    (-0.03, -0.02), (-0.06, -0.04), (-0.08, -0.06), (-0.10, -0.08),     # thumb
+    (-0.03, -0.09), (-0.035, -0.13), (-0.04, -0.16), (-0.045, -0.19),  # index
+    (0.0, -0.095), (0.0, -0.14), (0.0, -0.17), (0.0, -0.20),           # middle
+    (0.025, -0.09), (0.03, -0.13), (0.033, -0.16), (0.036, -0.18),     # ring
+    (0.05, -0.08), (0.06, -0.11), (0.065, -0.13), (0.07, -0.15),       # pinky
+], dtype=np.float32)
+
+# Gun: index and thumb out, middle/ring/pinky curled back towards the palm
+GUN_HAND = OPEN_HAND.copy()
+GUN_HAND[11:13] = [(0.005, -0.11), (0.01, -0.09)]
+GUN_HAND[15:17] = [(0.03, -0.10), (0.03, -0.085)]
+GUN_HAND[19:21] = [(0.055, -0.09), (0.05, -0.075)]
+
+
+def install_mediapipe_stub():
+    """Let face.py import without MediaPipe, the benchmark never runs the real model"""
+    try:
+        import mediapipe  # noqa: F401
+        return False
+    except ImportError:
+        pass
+
+    hands_module = types.SimpleNamespace(
+        Hands=lambda **kwargs: None,
+        HAND_CONNECTIONS=frozenset([
+            (0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8),
+            (5, 9), (9, 10), (10, 11), (11, 12), (9, 13), (13, 14), (14, 15), (15, 16),
+            (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+        ]),
+    )
+    stub = types.ModuleType("mediapipe")
+    stub.solutions = types.SimpleNamespace(hands=hands_module)
+    sys.modules["mediapipe"] = stub
+    return True
+
+
+def place_hand(shape, wrist_x, wrist_y, rng, jitter=0.002):
+    """(21, 3) landmarks for a hand shape with its wrist at (wrist_x, wrist_y)"""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[:, :2] = shape + (wrist_x, wrist_y) + rng.normal(0, jitter, (21, 2))
+    return points
+
+
+def synthetic_scenarios(fps=30, seed=0):
+    """Named landmark sequences with the frame windows where each gesture should fire"""
+    rng = np.random.default_rng(seed)
+    idle = lambda count: [[] for _ in range(count)]
+
+    def wave(count, period=10, amplitude=0.12):
+        return [[place_hand(OPEN_HAND, 0.5 + amplitude * np.sin(2 * np.pi * i / period), 0.7, rng)]
+                for i in range(count)]
+
+    def still(shape, count):
+        return [[place_hand(shape, 0.5, 0.7, rng)] for _ in range(count)]
+
+    scenarios = []
+
+    frames, expected = [], {"wave": [], "gun": []}
+    for kind, segment in [("idle", idle(30)), ("wave", wave(60)), ("idle", idle(30)),
+                          ("gun", still(GUN_HAND, 45)), ("idle", idle(30))]:
+        if kind != "idle":
+            # Allow a few frames after the gesture ends for confirmation
+            expected[kind].append([len(frames), len(frames) + len(segment) + 5])
+        frames.extend(segment)
+    scenarios.append({"name": "synthetic_mixed", "fps": fps, "frames": frames, "expected": expected})
+
+    scenarios.append({"name": "synthetic_still_hand", "fps": fps,
+                      "frames": still(OPEN_HAND, 150), "expected": {"wave": [], "gun": []}})
+
+    two_hands = [[place_hand(OPEN_HAND, 0.3 + 0.1 * np.sin(2 * np.pi * i / 10), 0.7, rng),
+                  place_hand(GUN_HAND, 0.75, 0.6, rng)] for i in range(90)]
+    scenarios.append({"name": "synthetic_two_hands", "fps": fps, "frames": two_hands,
+                      "expected": {"wave": [[0, 95]], "gun": [[0, 95]]}})
+    return scenarios
+
+
+def load_fixture(path):
+    with open(path) as f:
+        fixture = json.load(f)
+    fixture["frames"] = [[np.array(hand, dtype=np.float32) for hand in hands] for hands in fixture["frames"]]
+    fixture.setdefault("expected", {"wave": [], "gun": []})
+    fixture.setdefault("fps", 30)
+    return fixture
+
+
+class FixtureHands:
+    """Stands in for mediapipe Hands: process() returns the next frame's recorded landmarks"""
+
+    def __init__(self, frames, inference_ms=0.0):
+        self.inference_s = inference_ms / 1000.0
+        self.index = 0
+        # Build the result objects up front so the stub itself costs ~nothing
+        self.results = [types.SimpleNamespace(multi_hand_landmarks=[
+            types.SimpleNamespace(landmark=[types.SimpleNamespace(x=float(x), y=float(y), z=float(z))
+                                            for x, y, z in hand])
+            for hand in hands
+        ] or None) for hands in frames]
+
+    def process(self, rgb_image):
+        # Lets the benchmark split the detector's find_hands() into color conversion and inference
+        self.called_at = time.perf_counter()
+        if self.inference_s:
+            time.sleep(self.inference_s)
+        result = self.results[min(self.index, len(self.results) - 1)]
+        self.index += 1
+        return result
+
+
+def parse_setting(value):
+    """--set value as a Python literal (False, None, 25, 0.5), otherwise the raw string"""
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+def stats_ms(samples):
+    values = np.array(samples) * 1000.0
+    if len(values) == 0:
+        return {"mean": 0.0, "p50": 0.0, "p99": 0.0}
+    return {
+        "mean": round(float(values.mean()), 4),
+        "p50": round(float(np.percentile(values, 50)), 4),
+        "p99": round(float(np.percentile(values, 99)), 4),
+    }
+
+
+def score_events(events, windows):
+    """Hits = events inside an expected window; recall = windows with at least one event"""
+    hits = [e for e in events if any(start <= e.frame_seq <= end for start, end in windows)]
+    found = [w for w in windows if any(w[0] <= e.frame_seq <= w[1] for e in events)]
+    return {
+        "expected": len(windows),
+        "detected": len(events),
+        "hits": len(hits),
+        "precision": round(len(hits) / len(events), 3) if events else (1.0 if not windows else 0.0),
+        "recall": round(len(found) / len(windows), 3) if windows else 1.0,
+    }
+
+
+def run_scenario(fixture, source, settings, render=True, inference_ms=0.0):
+    from face import HandGestureDetector
+
+    detector = HandGestureDetector(source=source, headless=True)
+    for name, value in settings.items():
+        setattr(detector, name, parse_setting(value))
+    hands = FixtureHands(fixture["frames"], inference_ms)
+    detector.hands = hands
+    # Gesture cooldowns follow the recording's frame clock, not wall time
+    detector.clock = lambda: detector.frame_seq / fixture["fps"]
+
+    timings = {stage: [] for stage in STAGES}
+    latencies = []
+    events = []
+
+    source.open()
+    start = time.perf_counter()
+    for index in range(len(fixture["frames"])):
+        t0 = time.perf_counter()
+        ok, frame = source.read()
+        if not ok:
+            break
+        t1 = time.perf_counter()
+        frame = detector.resize_frame(frame)
+        t2 = time.perf_counter()
+        # The detector's own stages, so the benchmark measures the shipped code
+        hand_points = detector.find_hands(hands, frame)
+        t3 = hands.called_at
+        t4 = time.perf_counter()
+        detector.frame_seq = index
+        _, hand_count = detector.analyze_hands(frame, hand_points)
+        events.extend(detector.frame_gestures)
+        t5 = time.perf_counter()
+        if render:
+            detector.render(frame, hand_count)
+        t6 = time.perf_counter()
+
+        for stage, (a, b) in zip(STAGES, [(t0, t1), (t1, t2), (t2, t3), (t3, t4), (t4, t5), (t5, t6)]):
+            timings[stage].append(b - a)
+        latencies.append(t6 - t0)
+    total = time.perf_counter() - start
+    source.release()
+    detector.events.close()
+
+    return {
+        "name": fixture["name"],
+        "frames": len(latencies),
+        "total_s": round(total, 4),
+        "throughput_fps": round(len(latencies) / total, 1) if total > 0 else 0.0,
+        "latency_ms": stats_ms(latencies),
+        "stages_ms": {stage: stats_ms(samples) for stage, samples in timings.items()},
+        "accuracy": {kind: score_events([e for e in events if e.kind == kind], fixture["expected"].get(kind, []))
+                     for kind in ("wave", "gun")},
+    }
+
+
+def record_fixture(clip_path, out_path):
+    """Run real MediaPipe over a clip and save its landmarks as a fixture (label 'expected' by hand)"""
+    import mediapipe as mp
+    from face import landmarks_to_array
+
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2,
+                                     min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    cap = cv2.VideoCapture(clip_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        points = landmarks_to_array(results.multi_hand_landmarks) if results.multi_hand_landmarks else []
+        frames.append([np.round(hand, 5).tolist() for hand in points])
+    cap.release()
+
+    with open(out_path, "w") as f:
+        json.dump({"name": clip_path, "fps": fps, "frames": frames, "expected": {"wave": [], "gun": []}}, f)
+    print(f"💾 Recorded {len(frames)} frames of landmarks to {out_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hand gesture pipeline")
+    parser.add_argument("--clip", help="Video clip to replay (needs --fixture)")
+    parser.add_argument("--fixture", help="Landmark fixture JSON (from --record)")
+    parser.add_argument("--record", nargs=2, metavar=("CLIP", "FIXTURE"), help="Record a fixture with real MediaPipe")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Override a detector setting, e.g. wave_threshold=25")
+    parser.add_argument("--inference-ms", type=float, default=0.0, help="Simulated MediaPipe cost per frame")
+    parser.add_argument("--no-render", action="store_true", help="Skip the overlay stage")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixture(*args.record)
+        return
+
+    stubbed = install_mediapipe_stub()
+    from frame_sources import SyntheticSource, VideoFileSource
+
+    settings = dict(item.split("=", 1) for item in args.set)
+
+    runs = []
+    if args.fixture:
+        fixture = load_fixture(args.fixture)
+        if args.clip:
+            source = VideoFileSource(args.clip)
+        else:
+            source = SyntheticSource(num_frames=len(fixture["frames"]))
+        runs.append(run_scenario(fixture, source, settings, not args.no_render, args.inference_ms))
+    else:
+        for fixture in synthetic_scenarios():
+            source = SyntheticSource(num_frames=len(fixture["frames"]))
+            runs.append(run_scenario(fixture, source, settings, not args.no_render, args.inference_ms))
+
+    report = {
+        "benchmark": "gesture_pipeline",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "mediapipe_stubbed": stubbed,
+        "settings": settings,
+        "runs": runs,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"📊 Benchmark results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
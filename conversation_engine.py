@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+
+class ConversationEngine:
+    """Listen, recognize, think, synthesize and play as separate asyncio stages
+
+    Stages are connected by small bounded queues, so the microphone keeps capturing while
+    the robot is thinking or talking. A new utterance while the robot is busy starts a new
+    turn (barge-in): older turns are dropped from every queue and playback is stopped.
+    An error in one turn is printed and that turn ends; the conversation keeps going.
+
+    The engine is wired up with plain callables:
+        start_listening(on_audio) -> stop function  (on_audio(audio) is called from any thread;
+                                                     it must not pass on the robot's own voice)
+        recognize(audio) -> text or None            (blocking, runs in a thread)
+        respond(text) -> reply text, an iterable of sentences, or None  (blocking, runs in a thread)
+        synthesize(text) -> audio file              (coroutine)
+        play(audio_file)                            (blocking, runs in a thread)
+        stop_playback()                             (interrupts play)
+    """
+
+    def __init__(self, start_listening, recognize, respond, synthesize, play, stop_playback,
+                 queue_size=2, barge_in=True):
+        self.start_listening = start_listening
+        self.recognize = recognize
+        self.respond = respond
+        self.synthesize = synthesize
+        self.play = play
+        self.stop_playback = stop_playback
+        self.queue_size = queue_size
+        self.barge_in = barge_in
+
+        self.loop = None
+        self.audio_queue = None
+        self.text_queue = None
+        self.reply_queue = None
+        self.speech_queue = None
+
+        self.turn = 0  # Incremented for every new utterance; stale work is dropped
+        self.busy_turns = set()  # Turns still being answered or spoken
+        self.missed_utterances = 0
+        self.stats = []  # Per-turn timing: heard -> recognized -> first reply -> first audio
+
+    def put_latest(self, queue, item):
+        """Put without waiting; when full, drop the oldest item (and count missed speech)"""
+        if queue.full():
+            queue.get_nowait()
+            if queue is self.audio_queue:
+                self.missed_utterances += 1
+        queue.put_nowait(item)
+
+    def on_audio(self, audio):
+        """Called by the microphone thread for every captured phrase"""
+        self.loop.call_soon_threadsafe(self.put_latest, self.audio_queue, (time.time(), audio))
+
+    def interrupt(self):
+        """Barge-in: forget everything older than the current turn and stop talking"""
+        self.stop_playback()
+        for queue in (self.reply_queue, self.speech_queue):
+            while not queue.empty():
+                queue.get_nowait()
+
+    async def recognition_stage(self):
+        while True:
+            heard_at, audio = await self.audio_queue.get()
+            try:
+                text = await self.loop.run_in_executor(None, self.recognize, audio)
+            except Exception as e:
+                print(f"❌ Recognition error: {e}")
+                continue
+            if not text:
+                continue
+
+            if self.busy_turns and self.barge_in:
+                print("✋ Barge-in: stopping current reply")
+                self.interrupt()
+            self.turn += 1
+            self.busy_turns = {self.turn}
+            self.stats.append({"turn": self.turn, "heard": heard_at, "recognized": time.time()})
+            await self.text_queue.put((self.turn, text))
+
+    async def respond_stage(self):
+        while True:
+            turn, text = await self.text_queue.get()
+            if turn != self.turn:
+                continue
+            try:
+                reply = await self.loop.run_in_executor(None, self.respond, text)
+            except Exception as e:
+                print(f"❌ Error handling '{text}': {e}")
+                reply = None
+            if reply is None:
+                self.busy_turns.discard(turn)
+                continue
+
+            sentences = iter([reply]) if isinstance(reply, str) else iter(reply)
+            while turn == self.turn:
+                # Pull the next sentence in a thread, so streamed replies can start speaking early
+                try:
+                    sentence = await self.loop.run_in_executor(None, next, sentences, None)
+                except Exception as e:
+                    print(f"❌ Reply error: {e}")
+                    sentence = None
+                if sentence is None:
+                    break
+                if sentence.strip():
+                    self.mark(turn, "first_reply")
+                    await self.reply_queue.put((turn, sentence))
+            await self.reply_queue.put((turn, None))  # End of this turn's reply
+
+    async def synthesis_stage(self):
+        while True:
+            turn, sentence = await self.reply_queue.get()
+            if turn != self.turn:
+                continue
+            if sentence is None:
+                await self.speech_queue.put((turn, None))
+                continue
+            try:
+                audio_file = await self.synthesize(sentence)
+            except Exception as e:
+                print(f"❌ TTS Error: {e}")
+                continue
+            if audio_file:
+                await self.speech_queue.put((turn, audio_file))
+
+    async def playback_stage(self):
+        while True:
+            turn, audio_file = await self.speech_queue.get()
+            if audio_file is None:
+                self.busy_turns.discard(turn)
+                continue
+            if turn != self.turn:
+                continue
+            self.mark(turn, "first_audio")
+            try:
+                await self.loop.run_in_executor(None, self.play, audio_file)
+            except Exception as e:
+                print(f"❌ Playback error: {e}")
+
+    def mark(self, turn, name):
+        """Record the first time a turn reaches a stage"""
+        for entry in reversed(self.stats):
+            if entry["turn"] == turn:
+                if name not in entry:
+                    entry[name] = time.time()
+                    if name == "first_audio":
+                        print(f"⏱️  Turn {turn}: {entry[name] - entry['heard']:.2f}s from speech to first audio")
+                return
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self.audio_queue = asyncio.Queue(self.queue_size)
+        self.text_queue = asyncio.Queue(self.queue_size)
+        self.reply_queue = asyncio.Queue(self.queue_size * 4)
+        self.speech_queue = asyncio.Queue(self.queue_size)
+
+        stop_listening = self.start_listening(self.on_audio)
+        stages = [
+            asyncio.create_task(self.recognition_stage()),
+            asyncio.create_task(self.respond_stage()),
+            asyncio.create_task(self.synthesis_stage()),
+            asyncio.create_task(self.playback_stage()),
+        ]
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            for stage in stages:
+                stage.cancel()
+            stop_listening()
+            self.stop_playback()
+            print(f"📊 Turns: {self.turn}, missed utterances: {self.missed_utterances}")
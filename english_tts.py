@@ -1,22 +1,19 @@
-import os
 import asyncio
-import edge_tts
+from tts_service import get_tts_service
 
-async def speak_english_async(text):
-    # Use a male English neural voice with fast, expressive tone
-    voice = "en-US-GuyNeural"  # Male voice for better character representation
-    communicate = edge_tts.Communicate(
-        text,
-        voice=voice,
-        rate="+0%",      # Faster speed for energetic delivery
-        pitch="+0Hz"      # Neutral pitch
-    )
-    filename = "english_output.mp3"
-    try:
-        await communicate.save(filename)
-        os.system(f"mpg123 {filename} || ffplay -nodisp -autoexit {filename} || afplay {filename}")
-    except edge_tts.exceptions.NoAudioReceived:
-        print(f"No audio received from edge-tts for voice '{voice}'. Try updating edge-tts or using a different voice.")
+# Use a male English neural voice with fast, expressive tone
+VOICE = "en-US-GuyNeural"  # Male voice for better character representation
+RATE = "+0%"
+PITCH = "+0Hz"      # Neutral pitch
+
+async def synthesize_english(text):
+    """Path to an MP3 of this text (from the shared TTS cache when it was said before)"""
+    return await asyncio.wrap_future(get_tts_service().synthesize(text, VOICE, RATE, PITCH))
 
 def speak_english(text):
-    asyncio.run(speak_english_async(text))
\ No newline at end of file
+    """Queue text to be spoken, returns an Utterance handle right away"""
+    return get_tts_service().submit(text, VOICE, RATE, PITCH)
+
+async def speak_english_async(text):
+    """Speak text and wait until it has been played"""
+    return await asyncio.wrap_future(speak_english(text).future)
@@ -1,36 +1,99 @@
 import cv2
+import sys
 import time
-import requests
 import threading
-from queue import Queue
 import numpy as np
 import mediapipe as mp
 from collections import deque
 import math
+from frame_sources import make_frame_source
+from frame_buffer import LatestFrameBuffer
+from inference_pool import HandInferencePool, InferenceWorkerError
+from adaptive_quality import AdaptiveQualityController
+from roi_tracker import HandROITracker
+from wave_tracker import WaveTracker
+from gesture_events import GestureEventBus
+
+# MediaPipe hand landmark indices (same values as mp.solutions.hands.HandLandmark)
+NUM_HAND_LANDMARKS = 21
+WRIST = 0
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_FINGER_MCP = 5
+INDEX_FINGER_PIP = 6
+INDEX_FINGER_TIP = 8
+MIDDLE_FINGER_PIP = 10
+MIDDLE_FINGER_TIP = 12
+RING_FINGER_PIP = 14
+RING_FINGER_TIP = 16
+PINKY_PIP = 18
+PINKY_TIP = 20
+
+# Gun gesture: these tips must be further from the wrist than their joints...
+GUN_EXTENDED_TIPS = [INDEX_FINGER_TIP, THUMB_TIP]
+GUN_EXTENDED_JOINTS = [INDEX_FINGER_MCP, THUMB_IP]
+# ...and these tips closer to the wrist than their PIP joints
+GUN_FOLDED_TIPS = [MIDDLE_FINGER_TIP, RING_FINGER_TIP, PINKY_TIP]
+GUN_FOLDED_JOINTS = [MIDDLE_FINGER_PIP, RING_FINGER_PIP, PINKY_PIP]
+
+# Wave threshold and hand matching distance are in pixels at this processing width
+# and scaled to the actual one (adaptive quality steps it between 320 and 640)
+WAVE_REFERENCE_WIDTH = 640
+
+
+def landmarks_to_array(multi_hand_landmarks):
+    """Convert MediaPipe hand landmarks to a (hands, 21, 3) float32 array of normalized x, y, z"""
+    return np.array(
+        [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in multi_hand_landmarks],
+        dtype=np.float32
+    ).reshape(-1, NUM_HAND_LANDMARKS, 3)
+
+
+def finger_wrist_distances(hand_points):
+    """2D distance of every landmark to the wrist, shape (hands, 21)"""
+    xy = hand_points[:, :, :2]
+    return np.linalg.norm(xy - xy[:, WRIST:WRIST + 1], axis=2)
+
 
 class HandGestureDetector:
-    def __init__(self, ip_url):
+    def __init__(self, ip_url=None, headless=False, render_every_n_frames=1, source=None,
+                 inference_workers=0, latency_budget=None, roi_tracking=False, event_bus=None):
         self.ip_url = ip_url
         
-        # Initialize MediaPipe hands
+        # Frame source: IP camera by default, or any FrameSource / URL / device / file / directory
+        self.source = make_frame_source(source if source is not None else ip_url)
+        
+        # Initialize MediaPipe hands (in-process unless inference runs in worker processes)
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+        self.inference_workers = inference_workers
+        self.inference_pool = None
+        self.pending_frames = {}  # seq -> frame waiting for worker results
+        self.hands = None
+        if inference_workers == 0:
+            self.hands = self.create_hands()
+        
+        # ROI mode: run inference on crops around the hands found last frame (in-process only)
+        self.roi_tracker = None
+        self.roi_hands = None  # Hands per crop slot
+        if roi_tracking and inference_workers == 0:
+            self.roi_tracker = HandROITracker()
+            # One tracking-mode Hands per crop slot, so each crop keeps MediaPipe's
+            # detect-once-then-track shortcut (crops follow the hand, so it stays in view).
+            # Two hands per crop: hands close together share one merged crop
+            self.roi_hands = []
         
         # Wave detection parameters
-        self.wave_threshold = 30  # Minimum movement for wave detection
+        self.wave_threshold = 30  # Minimum movement for wave detection (pixels at WAVE_REFERENCE_WIDTH)
         self.wave_frames_required = 8  # Frames needed to confirm a wave
-        self.position_history = deque(maxlen=15)  # Store recent hand positions
+        self.wave_match_distance = 150  # Pixels (at WAVE_REFERENCE_WIDTH) a hand may move between frames
+        self.wave_tracker = WaveTracker(window=15, max_match_distance=self.wave_match_distance)
+        self.wave_states = []  # HandWaveState for each hand of the latest frame
         
         # Gun gesture detection parameters
         self.gun_confidence_threshold = 0.8  # Confidence needed for gun detection
         self.gun_hold_frames = 5  # Frames to hold gun gesture for confirmation
         self.gun_history = deque(maxlen=10)  # Store recent gun detection results
+        self.last_hand_points = np.zeros((0, NUM_HAND_LANDMARKS, 3), dtype=np.float32)  # Latest landmark tensor
         
         # Detection states
         self.wave_detected = False
@@ -46,63 +109,70 @@ class HandGestureDetector:
         self.target_width = 640
         self.process_every_n_frames = 1  # Process every frame for smooth tracking
         
-        # Threading for frame capture
-        self.frame_queue = Queue(maxsize=2)
+        # Adaptive quality: adjust stride and width to keep per-frame time within latency_budget (s)
+        self.quality_controller = None
+        if latency_budget:
+            self.quality_controller = AdaptiveQualityController(
+                latency_budget=latency_budget, max_width=self.target_width
+            )
+        self.hand_motion = 0.0  # Hand center movement since last frame, fraction of frame width
+        
+        # Rendering settings (headless = no drawing, no frame copies, no GUI calls)
+        self.headless = headless
+        self.render_every_n_frames = render_every_n_frames  # Render/show every Nth processed frame
+        
+        # Latest detection results, kept for the renderer
+        self.last_centers = []
+        self.frame_width = None  # Width of the frames the trackers' pixel state refers to
+        self.last_hand_ids = []  # Stable hand IDs, same order as last_centers
+        self.last_gun_confidences = []
+        self.wave_stats = {}  # hand_idx -> (x_range, direction_changes, is_wave, position)
+        self.frame_gestures = []  # GestureEvents confirmed on the latest processed frame
+        
+        # Confirmed gestures are published here, subscribers run on their own threads
+        self.events = event_bus if event_bus is not None else GestureEventBus()
+        self.is_fullscreen = False
+        
+        # Threading for frame capture (newest-frame hand-off, see frame_buffer.py)
+        self.frame_buffer = LatestFrameBuffer()
         self.stop_capture = False
         self.capture_thread = None
         
+        # Clock for gesture cooldowns and overlay timing (replaceable for deterministic replays)
+        self.clock = time.time
+        
         # Performance tracking
+        self.frame_seq = 0  # Sequence number of the frame being processed
+        self.analyzed_seq = 0  # Sequence number of the frame being analyzed (behind frame_seq with workers)
+        self.frame_latency = 0.0  # Capture -> processing start, seconds
         self.fps_counter = 0
         self.fps_start_time = time.time()
         self.current_fps = 0.0
         
+    def create_hands(self):
+        """In-process MediaPipe hands for full frames"""
+        return self.mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=2,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+    
     def test_connection(self):
-        """Test if the IP camera is accessible"""
-        print(f"🔍 Testing connection to: {self.ip_url}")
-        
-        try:
-            response = requests.get(self.ip_url, timeout=5, stream=True)
-            if response.status_code == 200:
-                print("✅ HTTP connection successful!")
-                
-                cap = cv2.VideoCapture(self.ip_url)
-                if cap.isOpened():
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        height, width = frame.shape[:2]
-                        print(f"✅ Camera connected! Resolution: {width}x{height}")
-                        cap.release()
-                        return True
-                    else:
-                        print("❌ Connected but cannot read frames")
-                        cap.release()
-                        return False
-                else:
-                    print("❌ OpenCV cannot connect to camera")
-                    return False
-            else:
-                print(f"❌ HTTP Error {response.status_code}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Connection error: {e}")
-            return False
+        """Test if the frame source is accessible"""
+        return self.source.test()
     
-    def capture_frames(self, cap):
+    def capture_frames(self, source):
         """Threaded frame capture"""
         while not self.stop_capture:
-            ret, frame = cap.read()
+            ret, frame = source.read()
             if ret:
-                if not self.frame_queue.full():
-                    self.frame_queue.put(frame)
-                else:
-                    try:
-                        self.frame_queue.get_nowait()
-                    except:
-                        pass
-                    self.frame_queue.put(frame)
+                self.frame_buffer.put(frame)
+            elif source.finished:
+                break
             else:
                 time.sleep(0.01)
+        self.frame_buffer.close()
     
     def resize_frame(self, frame):
         """Resize frame for faster processing"""
@@ -113,145 +183,125 @@ class HandGestureDetector:
             frame = cv2.resize(frame, (self.target_width, new_height), interpolation=cv2.INTER_LINEAR)
         return frame
     
-    def detect_gun_gesture(self, hand_landmarks, frame, hand_idx):
-        """Detect gun gesture (pointing with index finger)"""
-        try:
-            h, w, _ = frame.shape
-            
-            # Get key landmarks
-            landmarks = hand_landmarks.landmark
-            
-            # Finger tip and pip (joint) positions
-            index_tip = landmarks[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-            index_pip = landmarks[self.mp_hands.HandLandmark.INDEX_FINGER_PIP]
-            index_mcp = landmarks[self.mp_hands.HandLandmark.INDEX_FINGER_MCP]
-            
-            middle_tip = landmarks[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-            middle_pip = landmarks[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP]
-            
-            ring_tip = landmarks[self.mp_hands.HandLandmark.RING_FINGER_TIP]
-            ring_pip = landmarks[self.mp_hands.HandLandmark.RING_FINGER_PIP]
-            
-            pinky_tip = landmarks[self.mp_hands.HandLandmark.PINKY_TIP]
-            pinky_pip = landmarks[self.mp_hands.HandLandmark.PINKY_PIP]
-            
-            thumb_tip = landmarks[self.mp_hands.HandLandmark.THUMB_TIP]
-            thumb_ip = landmarks[self.mp_hands.HandLandmark.THUMB_IP]
-            
-            wrist = landmarks[self.mp_hands.HandLandmark.WRIST]
-            
-            # Convert to pixel coordinates
-            def to_pixel(landmark):
-                return (int(landmark.x * w), int(landmark.y * h))
-            
-            index_tip_px = to_pixel(index_tip)
-            index_mcp_px = to_pixel(index_mcp)
-            wrist_px = to_pixel(wrist)
-            
-            # Gun gesture criteria:
-            gun_score = 0
-            max_score = 5
-            
-            # 1. Index finger extended (tip further from wrist than MCP)
-            index_extended = self.distance(index_tip, wrist) > self.distance(index_mcp, wrist)
-            if index_extended:
-                gun_score += 1
-            
-            # 2. Middle finger folded (tip closer to wrist than PIP)
-            middle_folded = self.distance(middle_tip, wrist) < self.distance(middle_pip, wrist)
-            if middle_folded:
-                gun_score += 1
-            
-            # 3. Ring finger folded
-            ring_folded = self.distance(ring_tip, wrist) < self.distance(ring_pip, wrist)
-            if ring_folded:
-                gun_score += 1
-            
-            # 4. Pinky folded
-            pinky_folded = self.distance(pinky_tip, wrist) < self.distance(pinky_pip, wrist)
-            if pinky_folded:
-                gun_score += 1
-            
-            # 5. Thumb extended (can be up or to the side)
-            thumb_extended = self.distance(thumb_tip, wrist) > self.distance(thumb_ip, wrist)
-            if thumb_extended:
-                gun_score += 1
-            
-            # Calculate confidence
-            confidence = gun_score / max_score
-            
-            # Draw gun gesture analysis
-            analysis_text = f"Gun: {confidence:.1f}"
-            cv2.putText(frame, analysis_text, (index_tip_px[0]-30, index_tip_px[1]-30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
-            
-            # Draw pointing direction line if gun detected
-            if confidence >= self.gun_confidence_threshold:
-                # Calculate pointing direction
-                direction_x = index_tip_px[0] - index_mcp_px[0]
-                direction_y = index_tip_px[1] - index_mcp_px[1]
-                
-                # Extend the line to show pointing direction
-                line_length = 100
-                if direction_x != 0 or direction_y != 0:
-                    norm = math.sqrt(direction_x**2 + direction_y**2)
-                    direction_x = int(direction_x / norm * line_length)
-                    direction_y = int(direction_y / norm * line_length)
-                    
-                    end_point = (index_tip_px[0] + direction_x, index_tip_px[1] + direction_y)
-                    cv2.arrowedLine(frame, index_tip_px, end_point, (0, 0, 255), 3, tipLength=0.3)
+    def detect_gun_gestures(self, hand_points):
+        """Gun confidence for every hand at once from a (hands, 21, 3) landmark array"""
+        if len(hand_points) == 0:
+            return np.zeros(0, dtype=np.float32)
+        
+        # Distance of every landmark to its own wrist, shape (hands, 21)
+        wrist_dist = finger_wrist_distances(hand_points)
+        
+        # Gun gesture criteria:
+        # index and thumb extended (tip further from wrist than joint),
+        # middle, ring and pinky folded (tip closer to wrist than PIP)
+        extended = wrist_dist[:, GUN_EXTENDED_TIPS] > wrist_dist[:, GUN_EXTENDED_JOINTS]
+        folded = wrist_dist[:, GUN_FOLDED_TIPS] < wrist_dist[:, GUN_FOLDED_JOINTS]
+        gun_score = extended.sum(axis=1) + folded.sum(axis=1)
+        
+        max_score = len(GUN_EXTENDED_TIPS) + len(GUN_FOLDED_TIPS)
+        return (gun_score / max_score).astype(np.float32)
+    
+    def draw_gun_gesture(self, frame, points, confidence):
+        """Draw gun gesture analysis for one hand"""
+        h, w, _ = frame.shape
+        index_tip_px = (int(points[INDEX_FINGER_TIP, 0] * w), int(points[INDEX_FINGER_TIP, 1] * h))
+        index_mcp_px = (int(points[INDEX_FINGER_MCP, 0] * w), int(points[INDEX_FINGER_MCP, 1] * h))
+        
+        analysis_text = f"Gun: {confidence:.1f}"
+        cv2.putText(frame, analysis_text, (index_tip_px[0]-30, index_tip_px[1]-30), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+        
+        # Draw pointing direction line if gun detected
+        if confidence >= self.gun_confidence_threshold:
+            # Calculate pointing direction
+            direction_x = index_tip_px[0] - index_mcp_px[0]
+            direction_y = index_tip_px[1] - index_mcp_px[1]
+            
+            # Extend the line to show pointing direction
+            line_length = 100
+            if direction_x != 0 or direction_y != 0:
+                norm = math.sqrt(direction_x**2 + direction_y**2)
+                direction_x = int(direction_x / norm * line_length)
+                direction_y = int(direction_y / norm * line_length)
                 
-                # Add gun gesture label
-                cv2.putText(frame, 'GUN!', (index_tip_px[0]-20, index_tip_px[1]-50), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+                end_point = (index_tip_px[0] + direction_x, index_tip_px[1] + direction_y)
+                cv2.arrowedLine(frame, index_tip_px, end_point, (0, 0, 255), 3, tipLength=0.3)
             
-            return confidence
-            
-        except Exception as e:
-            print(f"Gun gesture detection error: {e}")
-            return 0.0
-    
-    def distance(self, point1, point2):
-        """Calculate Euclidean distance between two landmarks"""
-        return math.sqrt((point1.x - point2.x)**2 + (point1.y - point2.y)**2)
+            # Add gun gesture label
+            cv2.putText(frame, 'GUN!', (index_tip_px[0]-20, index_tip_px[1]-50), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
     
     def detect_hands_and_gestures(self, frame):
-        """Detect hands and analyze for gestures"""
+        """Detect hands and analyze for gestures (no drawing, see render)"""
+        self.check_frame_width(frame.shape[1])
+        regions = self.roi_tracker.plan(frame.shape) if self.roi_tracker else None
+        
+        if regions is None:
+            hand_points = self.find_hands(self.hands, frame)
+        else:
+            hand_points = self.find_hands_in_regions(frame, regions)
+        
+        if self.roi_tracker:
+            self.roi_tracker.update(hand_points, frame.shape)
+        
+        return self.analyze_hands(frame, hand_points)
+    
+    def find_hands(self, hands, image):
+        """Run MediaPipe on a BGR image, returns a (hands, 21, 3) array of normalized landmarks"""
         # Convert BGR to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        results = hands.process(rgb_image)
         
+        if results.multi_hand_landmarks:
+            # One (hands, 21, 3) array per frame, shared by every gesture check
+            return landmarks_to_array(results.multi_hand_landmarks)
+        return np.zeros((0, NUM_HAND_LANDMARKS, 3), dtype=np.float32)
+    
+    def find_hands_in_regions(self, frame, regions):
+        """Run MediaPipe on each region crop, landmarks mapped back to full-frame coordinates"""
+        h, w, _ = frame.shape
+        found = []
+        for slot, (x0, y0, x1, y1) in enumerate(regions):
+            if slot == len(self.roi_hands):
+                self.roi_hands.append(self.create_hands())
+            points = self.find_hands(self.roi_hands[slot], frame[y0:y1, x0:x1])
+            if len(points) == 0:
+                continue
+            crop_w, crop_h = x1 - x0, y1 - y0
+            points[:, :, 0] = (x0 + points[:, :, 0] * crop_w) / w
+            points[:, :, 1] = (y0 + points[:, :, 1] * crop_h) / h
+            points[:, :, 2] *= crop_w / w
+            found.append(points)
+        
+        if not found:
+            return np.zeros((0, NUM_HAND_LANDMARKS, 3), dtype=np.float32)
+        return np.concatenate(found)
+    
+    def analyze_hands(self, frame, hand_points, frame_seq=None):
+        """Run gesture analysis on a (hands, 21, 3) landmark array for this frame
+
+        frame_seq: sequence number of the frame the landmarks belong to (default: frame_seq)
+        """
+        self.analyzed_seq = self.frame_seq if frame_seq is None else frame_seq
+        self.check_frame_width(frame.shape[1])
         current_positions = []
         gun_confidences = []
+        self.frame_gestures = []
         
-        if results.multi_hand_landmarks:
-            for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                # Draw hand landmarks
-                self.mp_draw.draw_landmarks(
-                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                    self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                    self.mp_draw.DrawingSpec(color=(255, 0, 0), thickness=2)
-                )
-                
-                # Get hand center position for wave detection
-                wrist = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
-                index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                h, w, _ = frame.shape
-                wrist_x, wrist_y = int(wrist.x * w), int(wrist.y * h)
-                tip_x, tip_y = int(index_tip.x * w), int(index_tip.y * h)
-                
-                center_x = (wrist_x + tip_x) // 2
-                center_y = (wrist_y + tip_y) // 2
-                current_positions.append((center_x, center_y))
-                
-                # Detect gun gesture
-                gun_confidence = self.detect_gun_gesture(hand_landmarks, frame, i)
-                gun_confidences.append(gun_confidence)
-                
-                # Draw hand center
-                cv2.circle(frame, (center_x, center_y), 8, (255, 255, 0), -1)
-                cv2.putText(frame, f'Hand {i+1}', (center_x-30, center_y-20), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+        if len(hand_points) > 0:
+            gun_confidences = self.detect_gun_gestures(hand_points).tolist()
+            
+            # Hand center (midpoint of wrist and index tip) for wave detection
+            h, w, _ = frame.shape
+            pixel_points = (hand_points[:, :, :2] * (w, h)).astype(int)
+            centers = (pixel_points[:, WRIST] + pixel_points[:, INDEX_FINGER_TIP]) // 2
+            current_positions = [(int(x), int(y)) for x, y in centers]
+        
+        self.hand_motion = self.measure_hand_motion(current_positions, frame.shape[1])
+        self.last_hand_points = hand_points
+        self.last_centers = current_positions
+        self.last_gun_confidences = gun_confidences
+        self.wave_stats = {}
         
         # Analyze wave motion
         self.analyze_wave_motion(current_positions, frame)
@@ -261,35 +311,98 @@ class HandGestureDetector:
         
         return frame, len(current_positions)
     
+    def check_frame_width(self, width):
+        """Tracker state is in pixels: rescale it when the processing width changes"""
+        if width == self.frame_width:
+            return
+        if self.frame_width:
+            ratio = width / self.frame_width
+            self.last_centers = [(int(x * ratio), int(y * ratio)) for x, y in self.last_centers]
+            self.wave_tracker.rescale(ratio)
+            if self.roi_tracker:
+                self.roi_tracker.rescale(ratio)
+        self.frame_width = width
+        self.wave_tracker.max_match_distance = self.wave_match_distance * width / WAVE_REFERENCE_WIDTH
+    
+    def measure_hand_motion(self, current_positions, width):
+        """Largest hand center movement since the previous frame, as a fraction of frame width"""
+        if not current_positions:
+            return 0.0
+        if len(current_positions) != len(self.last_centers):
+            return 1.0  # Hands appeared or left: treat as big motion
+        previous = np.array(self.last_centers, dtype=np.float32)
+        current = np.array(current_positions, dtype=np.float32)
+        return float(np.linalg.norm(current - previous, axis=1).max()) / width
+    
+    def draw_detections(self, frame):
+        """Draw landmarks, gun analysis and wave stats from the latest detection results"""
+        h, w, _ = frame.shape
+        if self.roi_tracker and self.roi_tracker.last_regions:
+            for x0, y0, x1, y1 in self.roi_tracker.last_regions:
+                cv2.rectangle(frame, (x0, y0), (x1, y1), (0, 165, 255), 1)
+        
+        for i, points in enumerate(self.last_hand_points):
+            # Draw hand landmarks
+            pixel_points = [(int(x * w), int(y * h)) for x, y in points[:, :2]]
+            for start, end in self.mp_hands.HAND_CONNECTIONS:
+                cv2.line(frame, pixel_points[start], pixel_points[end], (255, 0, 0), 2)
+            for point in pixel_points:
+                cv2.circle(frame, point, 2, (0, 255, 0), 2)
+            
+            self.draw_gun_gesture(frame, points, self.last_gun_confidences[i])
+            
+            # Draw hand center
+            center_x, center_y = self.last_centers[i]
+            cv2.circle(frame, (center_x, center_y), 8, (255, 255, 0), -1)
+            hand_label = self.last_hand_ids[i] if i < len(self.last_hand_ids) else i + 1
+            cv2.putText(frame, f'Hand {hand_label}', (center_x-30, center_y-20), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+        
+        for x_range, direction_changes, is_wave, pos in self.wave_stats.values():
+            cv2.putText(frame, f'Wave: H:{x_range:.0f} D:{direction_changes}', 
+                       (pos[0]-60, pos[1]+60), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
+            
+            if is_wave:
+                cv2.putText(frame, 'WAVING!', (pos[0]-30, pos[1]+80), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    
+    def render(self, frame, hand_count):
+        """Draw detections and the info overlay onto frame"""
+        self.draw_detections(frame)
+        self.add_overlay(frame, hand_count)
+        return frame
+    
     def analyze_wave_motion(self, current_positions, frame):
         """Analyze hand positions for waving motion"""
         if not current_positions:
-            if len(self.position_history) > 0:
-                self.position_history.clear()
+            self.wave_tracker.reset()
+            self.wave_states = []
+            self.last_hand_ids = []
             self.wave_detected = False
             return
         
-        timestamp = time.time()
-        self.position_history.append((current_positions, timestamp))
-        
-        if len(self.position_history) < self.wave_frames_required:
-            return
+        # Match hands to tracked IDs and update their wave stats with this sample
+        self.wave_states = self.wave_tracker.update(current_positions)
+        self.last_hand_ids = [state.hand_id for state in self.wave_states]
         
         for hand_idx in range(len(current_positions)):
             if self.detect_wave_for_hand(hand_idx, frame):
-                current_time = time.time()
+                current_time = self.clock()
                 
                 if current_time - self.last_wave_time > 1.0:
                     self.wave_count += 1
                     self.last_wave_time = current_time
                     self.wave_detected = True
                     self.wave_start_time = current_time
+                    self.frame_gestures.append(self.events.publish(
+                        "wave", hand_id=self.last_hand_ids[hand_idx], frame_seq=self.analyzed_seq
+                    ))
                     print(f"👋 WAVE DETECTED! Count: {self.wave_count}")
                     return "wave"
     
     def analyze_gun_gestures(self, gun_confidences, frame):
         """Analyze gun gestures"""
-        current_time = time.time()
+        current_time = self.clock()
         
         # Check if any hand shows gun gesture
         max_confidence = max(gun_confidences) if gun_confidences else 0.0
@@ -307,194 +420,253 @@ class HandGestureDetector:
                 self.last_gun_time = current_time
                 self.gun_detected = True
                 self.gun_start_time = current_time
+                hand_id = None
+                if gun_confidences and len(self.last_hand_ids) == len(gun_confidences):
+                    hand_id = self.last_hand_ids[gun_confidences.index(max_confidence)]
+                self.frame_gestures.append(self.events.publish(
+                    "gun", hand_id=hand_id, confidence=max_confidence, frame_seq=self.analyzed_seq
+                ))
                 print(f"🔫 GUN GESTURE DETECTED! Count: {self.gun_count}")
     
     def detect_wave_for_hand(self, hand_idx, frame):
-        """Detect waving motion for a specific hand"""
-        try:
-            recent_positions = []
-            for positions_list, timestamp in list(self.position_history):
-                if hand_idx < len(positions_list):
-                    recent_positions.append(positions_list[hand_idx])
-            
-            if len(recent_positions) < self.wave_frames_required:
-                return False
-            
-            x_positions = [pos[0] for pos in recent_positions]
-            y_positions = [pos[1] for pos in recent_positions]
-            
-            x_changes = []
-            for i in range(1, len(x_positions)):
-                x_changes.append(x_positions[i] - x_positions[i-1])
-            
-            direction_changes = 0
-            for i in range(1, len(x_changes)):
-                if (x_changes[i] > 0) != (x_changes[i-1] > 0):
-                    direction_changes += 1
-            
-            x_range = max(x_positions) - min(x_positions)
-            y_range = max(y_positions) - min(y_positions)
-            
-            is_wave = (
-                x_range > self.wave_threshold and
-                direction_changes >= 3 and
-                x_range > y_range * 0.7
-            )
-            
-            if hand_idx < len(recent_positions):
-                pos = recent_positions[-1]
-                cv2.putText(frame, f'Wave: H:{x_range:.0f} D:{direction_changes}', 
-                           (pos[0]-60, pos[1]+60), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
-                
-                if is_wave:
-                    cv2.putText(frame, 'WAVING!', (pos[0]-30, pos[1]+80), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            
-            return is_wave
-            
-        except Exception as e:
+        """Detect waving motion for a specific hand (stats are kept incrementally per hand ID)"""
+        if hand_idx >= len(self.wave_states):
             return False
+        
+        state = self.wave_states[hand_idx]
+        threshold = self.wave_threshold * frame.shape[1] / WAVE_REFERENCE_WIDTH
+        is_wave = state.is_wave(threshold, self.wave_frames_required)
+        
+        # Keep stats for the renderer instead of drawing here
+        if min(state.samples, state.window) >= self.wave_frames_required:
+            self.wave_stats[hand_idx] = (state.x_range(), state.direction_changes, is_wave, state.position)
+        
+        return is_wave
     
     def start_detection(self):
         """Start hand gesture detection"""
         if not self.test_connection():
             return False
             
-        print(f"\n🤚 Starting Hand Gesture Detection with: {self.ip_url}")
-        print("\n🎮 Controls:")
-        print("  'q' or ESC  - Quit")
-        print("  's'         - Save current frame")
-        print("  'r'         - Reset counters")
-        print("  'f'         - Toggle fullscreen")
-        print("  '+'         - Increase wave sensitivity")
-        print("  '-'         - Decrease wave sensitivity")
-        print("  'g'         - Adjust gun detection sensitivity")
-        
-        cap = cv2.VideoCapture(self.ip_url)
-        
-        if not cap.isOpened():
+        print(f"\n🤚 Starting Hand Gesture Detection with: {self.source.label}")
+        if self.headless:
+            print("\n🙈 Headless mode: no window, stop with Ctrl+C or stop_detection()")
+        else:
+            print("\n🎮 Controls:")
+            print("  'q' or ESC  - Quit")
+            print("  's'         - Save current frame")
+            print("  'r'         - Reset counters")
+            print("  'f'         - Toggle fullscreen")
+            print("  '+'         - Increase wave sensitivity")
+            print("  '-'         - Decrease wave sensitivity")
+            print("  'g'         - Adjust gun detection sensitivity")
+        
+        if not self.source.open():
             print("❌ Failed to open camera")
             return False
         
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        cap.set(cv2.CAP_PROP_FPS, 30)
-        
         self.stop_capture = False
-        self.capture_thread = threading.Thread(target=self.capture_frames, args=(cap,))
+        # Live sources keep only the newest frame, replay sources keep every frame in order
+        self.frame_buffer = LatestFrameBuffer(lossless=not self.source.live)
+        
+        if self.inference_workers > 0:
+            self.inference_pool = HandInferencePool(num_workers=self.inference_workers)
+            self.inference_pool.start()
+        
+        self.capture_thread = threading.Thread(target=self.capture_frames, args=(self.source,))
         self.capture_thread.daemon = True
         self.capture_thread.start()
         
         frame_count = 0
-        is_fullscreen = False
+        self.is_fullscreen = False
         
         print("✅ Hand gesture detection started!")
         print("👋 Wave Detection: Side-to-side hand movement")
         print("🔫 Gun Detection: Point with index finger, other fingers folded")
         
         try:
-            while True:
-                try:
-                    frame = self.frame_queue.get_nowait()
-                except:
-                    time.sleep(0.001)
+            running = True
+            while running and not self.stop_capture:
+                item = self.frame_buffer.get(timeout=0.5)
+                if item is None:
+                    if self.frame_buffer.closed:
+                        # Source finished or stop requested: finish frames still in the workers
+                        for _ in self.finish_inference():
+                            self.update_fps()
+                        break
                     continue
+                self.frame_seq, capture_time, frame = item
+                frame_start = time.time()
+                self.frame_latency = frame_start - capture_time
                 
                 frame_count += 1
-                display_frame = self.resize_frame(frame.copy())
-                
-                if frame_count % self.process_every_n_frames == 0:
-                    display_frame, hand_count = self.detect_hands_and_gestures(display_frame)
-                else:
-                    hand_count = 0
-                
-                self.update_fps()
-                self.add_overlay(display_frame, hand_count)
-                
-                window_name = 'Hand Gesture Detection - Wave & Gun'
-                cv2.imshow(window_name, display_frame)
-                
-                key = cv2.waitKey(1) & 0xFF
+                # Frames from the capture thread are ours, no copy needed
+                frame = self.resize_frame(frame)
                 
-                if key == ord('q') or key == 27:
-                    break
+                for frame, hand_count in self.process_frame(frame, frame_count):
+                    self.update_fps()
                     
-                elif key == ord('s'):
-                    filename = f"gesture_capture_{int(time.time())}.jpg"
-                    cv2.imwrite(filename, display_frame)
-                    print(f"📸 Frame saved: {filename}")
+                    # Headless: detection results only, no drawing and no GUI calls
+                    if self.headless or frame_count % self.render_every_n_frames != 0:
+                        continue
                     
-                elif key == ord('r'):
-                    self.wave_count = 0
-                    self.gun_count = 0
-                    self.position_history.clear()
-                    self.gun_history.clear()
-                    print("🔄 All counters reset!")
-                    
-                elif key == ord('+') or key == ord('='):
-                    self.wave_threshold = max(10, self.wave_threshold - 5)
-                    print(f"📈 Wave sensitivity increased (threshold: {self.wave_threshold})")
-                    
-                elif key == ord('-'):
-                    self.wave_threshold = min(100, self.wave_threshold + 5)
-                    print(f"📉 Wave sensitivity decreased (threshold: {self.wave_threshold})")
-                    
-                elif key == ord('g'):
-                    self.gun_confidence_threshold = 0.9 if self.gun_confidence_threshold < 0.9 else 0.6
-                    print(f"🎯 Gun sensitivity: {self.gun_confidence_threshold:.1f}")
-                    
-                elif key == ord('f'):
-                    if is_fullscreen:
-                        cv2.setWindowProperty(window_name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_NORMAL)
-                        is_fullscreen = False
-                        print("🪟 Windowed mode")
-                    else:
-                        cv2.setWindowProperty(window_name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
-                        is_fullscreen = True
-                        print("🖥️  Fullscreen mode")
+                    if not self.show_frame(self.render(frame, hand_count)):
+                        running = False
+                        break
+                
+                if self.quality_controller:
+                    self.adapt_quality(time.time() - frame_start)
         
         except KeyboardInterrupt:
             print("\n⏹️  Stopped by user (Ctrl+C)")
             
         finally:
             self.stop_capture = True
+            self.frame_buffer.close()  # Wakes a capture thread blocked in put() (lossless sources)
             if self.capture_thread:
                 self.capture_thread.join(timeout=1)
-            cap.release()
-            cv2.destroyAllWindows()
+            self.source.release()
+            if self.inference_pool:
+                self.inference_pool.stop()
+                self.inference_pool = None
+                self.pending_frames.clear()
+            if not self.headless:
+                cv2.destroyAllWindows()
             print(f"\n📊 Session Statistics:")
             print(f"   Total frames processed: {frame_count}")
+            print(f"   Frames dropped (stale): {self.frame_buffer.dropped}")
             print(f"   Waves detected: {self.wave_count}")
             print(f"   Gun gestures detected: {self.gun_count}")
             print(f"   Final FPS: {self.current_fps:.1f}")
             
         return True
     
+    def process_frame(self, frame, frame_count):
+        """Run detection on a frame, returns the (frame, hand_count) results that are ready, in order"""
+        if frame_count % self.process_every_n_frames != 0:
+            return [(frame, 0)]
+        
+        if self.inference_pool is None:
+            return [self.detect_hands_and_gestures(frame)]
+        
+        # Worker processes: results come back in frame order, possibly a few frames later
+        self.pending_frames[self.frame_seq] = frame
+        try:
+            self.inference_pool.submit(self.frame_seq, frame)
+            ready = self.inference_pool.collect()
+        except (InferenceWorkerError, ValueError) as e:  # ValueError: frame larger than the shared slots
+            return self.fall_back_to_in_process(e)
+        return [self.analyze_hands(self.pending_frames.pop(seq), hand_points, seq)
+                for seq, hand_points in ready]
+    
+    def adapt_quality(self, frame_time):
+        """Let the controller pick the next inference stride and resize width"""
+        stride, width = self.quality_controller.update(frame_time, len(self.last_centers), self.hand_motion)
+        if stride != self.process_every_n_frames or width != self.target_width:
+            print(f"⚖️  Quality: width {width}px, processing every {stride} frame(s)")
+        self.process_every_n_frames, self.target_width = stride, width
+    
+    def finish_inference(self):
+        """Analyze frames still being processed by the inference workers"""
+        if self.inference_pool is None:
+            return []
+        try:
+            ready = self.inference_pool.drain()
+        except InferenceWorkerError as e:
+            return self.fall_back_to_in_process(e)
+        return [self.analyze_hands(self.pending_frames.pop(seq), hand_points, seq)
+                for seq, hand_points in ready]
+    
+    def fall_back_to_in_process(self, error):
+        """Workers are gone (or cannot take the frames): stop the pool and run the frames they still had here"""
+        print(f"❌ {error}, falling back to in-process inference")
+        self.inference_pool.stop()
+        self.inference_pool = None
+        self.hands = self.create_hands()
+        results = []
+        for seq in sorted(self.pending_frames):
+            frame = self.pending_frames.pop(seq)
+            results.append(self.analyze_hands(frame, self.find_hands(self.hands, frame), seq))
+        return results
+    
+    def show_frame(self, display_frame):
+        """Show a rendered frame and handle keys, returns False when the user quits"""
+        window_name = 'Hand Gesture Detection - Wave & Gun'
+        cv2.imshow(window_name, display_frame)
+        
+        key = cv2.waitKey(1) & 0xFF
+        
+        if key == ord('q') or key == 27:
+            return False
+            
+        elif key == ord('s'):
+            filename = f"gesture_capture_{int(time.time())}.jpg"
+            cv2.imwrite(filename, display_frame)
+            print(f"📸 Frame saved: {filename}")
+            
+        elif key == ord('r'):
+            self.wave_count = 0
+            self.gun_count = 0
+            self.wave_tracker.reset()
+            self.gun_history.clear()
+            print("🔄 All counters reset!")
+            
+        elif key == ord('+') or key == ord('='):
+            self.wave_threshold = max(10, self.wave_threshold - 5)
+            print(f"📈 Wave sensitivity increased (threshold: {self.wave_threshold})")
+            
+        elif key == ord('-'):
+            self.wave_threshold = min(100, self.wave_threshold + 5)
+            print(f"📉 Wave sensitivity decreased (threshold: {self.wave_threshold})")
+            
+        elif key == ord('g'):
+            self.gun_confidence_threshold = 0.9 if self.gun_confidence_threshold < 0.9 else 0.6
+            print(f"🎯 Gun sensitivity: {self.gun_confidence_threshold:.1f}")
+            
+        elif key == ord('f'):
+            if self.is_fullscreen:
+                cv2.setWindowProperty(window_name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_NORMAL)
+                self.is_fullscreen = False
+                print("🪟 Windowed mode")
+            else:
+                cv2.setWindowProperty(window_name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+                self.is_fullscreen = True
+                print("🖥️  Fullscreen mode")
+        
+        return True
+    
+    def stop_detection(self):
+        """Ask the detection loop to stop (needed in headless mode, where there is no 'q' key)"""
+        self.stop_capture = True
+        self.frame_buffer.close()
+    
     def add_overlay(self, frame, hand_count):
         """Add information overlay"""
         height, width = frame.shape[:2]
         
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (400, 160), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+        # Darken the info panel in place (same as a 60% black overlay, without a full-frame copy)
+        panel = frame[:161, :401]
+        np.multiply(panel, 0.4, out=panel, casting='unsafe')
         
-        current_time = time.time()
+        current_time = self.clock()
         wave_active = self.wave_detected and (current_time - self.wave_start_time < 1.0)
         gun_active = self.gun_detected and (current_time - self.gun_start_time < 1.5)
         
         info_lines = [
-            f"IP Camera: {self.ip_url.split('/')[-2]}",
+            f"Source: {self.source.label}",
             f"Hands Detected: {hand_count}",
             f"Waves Detected: {self.wave_count}",
             f"Gun Gestures: {self.gun_count}",
             f"FPS: {self.current_fps:.1f}",
             f"Wave Sensitivity: {self.wave_threshold}",
             f"Gun Sensitivity: {self.gun_confidence_threshold:.1f}",
+            f"Quality: {self.target_width}px, every {self.process_every_n_frames} frame(s)",
             f"Status: {'WAVING!' if wave_active else 'GUN!' if gun_active else 'Monitoring...'}"
         ]
         
         for i, line in enumerate(info_lines):
             y_position = 15 + (i * 18)
-            if i == 7:  # Status line
+            if i == len(info_lines) - 1:  # Status line
                 color = (0, 255, 0) if wave_active else (0, 0, 255) if gun_active else (255, 255, 255)
             else:
                 color = (255, 255, 255)
@@ -535,10 +707,19 @@ class HandGestureDetector:
 def main():
     """Main function"""
     CAMERA_URL = "http://10.140.51.207:8080/video"
+    HEADLESS = "--headless" in sys.argv
+    WORKERS = next((int(arg.split("=")[1]) for arg in sys.argv if arg.startswith("--workers=")), 0)
+    ROI = "--roi" in sys.argv
+    BUDGET = next((float(arg.split("=")[1]) for arg in sys.argv if arg.startswith("--budget=")), None)
+    
+    # Optional source: python face.py [--headless] [--workers=N] [--budget=SECONDS] [--roi] [url | device | video file | jpeg dir | synthetic]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if args:
+        CAMERA_URL = args[0]
     
     print("🤚 IP Camera Hand Gesture Detection")
     print("=" * 50)
-    print(f"Camera URL: {CAMERA_URL}")
+    print(f"Camera source: {CAMERA_URL}")
     print("\n📋 Detects:")
     print("   👋 Wave Gesture - Side-to-side hand movement")
     print("   🔫 Gun Gesture - Point with index finger")
@@ -546,7 +727,8 @@ def main():
     print("   pip install mediapipe opencv-python requests numpy")
     
     try:
-        detector = HandGestureDetector(CAMERA_URL)
+        detector = HandGestureDetector(CAMERA_URL, headless=HEADLESS, inference_workers=WORKERS,
+                                       latency_budget=BUDGET, roi_tracking=ROI)
         success = detector.start_detection()
         
         if success:
@@ -0,0 +1,70 @@
+import time
+import threading
+
+
+class LatestFrameBuffer:
+    """Small preallocated ring of (seq, timestamp, frame) that always serves the newest frame
+
+    Live mode: the producer never waits, older unread frames are overwritten and counted
+    in `dropped`. Lossless mode (replay sources): the producer waits for a free slot so
+    every frame is consumed in order. Consumers block on a condition instead of polling.
+    """
+
+    def __init__(self, capacity=2, lossless=False):
+        self.capacity = capacity
+        self.lossless = lossless
+        self.slots = [None] * capacity  # Fixed slots, reused round-robin
+        self.condition = threading.Condition()
+        self.write_seq = 0  # Sequence number of the newest frame written
+        self.read_seq = 0   # Sequence number of the last frame handed out
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, frame, timestamp=None):
+        """Store a frame, returns its sequence number (None if the buffer is closed)"""
+        if timestamp is None:
+            timestamp = time.time()
+        with self.condition:
+            if self.lossless:
+                while not self.closed and self.write_seq - self.read_seq >= self.capacity:
+                    self.condition.wait()
+            if self.closed:
+                return None
+            self.write_seq += 1
+            self.slots[self.write_seq % self.capacity] = (self.write_seq, timestamp, frame)
+            self.condition.notify_all()
+            return self.write_seq
+
+    def get(self, timeout=None):
+        """Wait for a frame newer than the last one read, returns (seq, timestamp, frame) or None"""
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.write_seq > self.read_seq or self.closed, timeout):
+                return None
+            if self.write_seq == self.read_seq:
+                return None  # Closed and drained
+
+            if self.lossless:
+                seq = self.read_seq + 1
+            else:
+                seq = self.write_seq
+                self.dropped += seq - self.read_seq - 1
+            self.read_seq = seq
+
+            item = self.slots[seq % self.capacity]
+            self.slots[seq % self.capacity] = None  # Consumer owns the frame now
+            self.condition.notify_all()
+            return item
+
+    def close(self):
+        """Wake everyone up, no more frames will be written"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def reset(self):
+        with self.condition:
+            self.slots = [None] * self.capacity
+            self.write_seq = 0
+            self.read_seq = 0
+            self.dropped = 0
+            self.closed = False
@@ -0,0 +1,246 @@
+import os
+import glob
+import time
+import cv2
+import numpy as np
+
+
+class FrameSource:
+    """Base frame source: open(), read() -> (ok, frame), release()"""
+
+    # Live sources drop stale frames; replay sources hand over every frame in order
+    live = True
+
+    def __init__(self, label):
+        self.label = label
+        self.finished = False  # True once a finite source has no more frames
+
+    def open(self):
+        return True
+
+    def read(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def test(self):
+        """Open the source, read one frame and release it again"""
+        print(f"🔍 Testing frame source: {self.label}")
+        try:
+            if not self.open():
+                print("❌ Cannot open frame source")
+                return False
+            ret, frame = self.read()
+            self.release()
+            if ret and frame is not None:
+                height, width = frame.shape[:2]
+                print(f"✅ Source ready! Resolution: {width}x{height}")
+                return True
+            print("❌ Opened but cannot read frames")
+            return False
+        except Exception as e:
+            print(f"❌ Frame source error: {e}")
+            return False
+
+
+class CaptureSource(FrameSource):
+    """Anything cv2.VideoCapture can open"""
+
+    def __init__(self, target, label=None, api_preference=cv2.CAP_ANY):
+        super().__init__(label or str(target))
+        self.target = target
+        self.api_preference = api_preference
+        self.cap = None
+
+    def open(self):
+        self.finished = False
+        self.cap = cv2.VideoCapture(self.target, self.api_preference)
+        if not self.cap.isOpened():
+            return False
+        self.configure(self.cap)
+        return True
+
+    def configure(self, cap):
+        pass
+
+    def read(self):
+        if self.cap is None:
+            return False, None
+        return self.cap.read()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class IPCameraSource(CaptureSource):
+    """HTTP/MJPEG stream from the phone IP camera app"""
+
+    def __init__(self, url):
+        super().__init__(url, label=f"IP Camera: {url}")
+        self.url = url
+
+    def configure(self, cap):
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        cap.set(cv2.CAP_PROP_FPS, 30)
+
+    def test(self):
+        """Check HTTP first so a dead phone fails fast, then read a frame"""
+        import http_client
+
+        print(f"🔍 Testing connection to: {self.url}")
+        try:
+            response = http_client.get(self.url, endpoint="camera", stream=True)
+            response.close()
+            if response.status_code != 200:
+                print(f"❌ HTTP Error {response.status_code}")
+                return False
+            print("✅ HTTP connection successful!")
+        except Exception as e:
+            print(f"❌ Connection error: {e}")
+            return False
+        return super().test()
+
+
+class DeviceSource(CaptureSource):
+    """Local V4L2 camera, by index (0) or device path (/dev/video0)"""
+
+    def __init__(self, device=0, width=None, height=None, fps=30):
+        super().__init__(device, label=f"Device: {device}", api_preference=cv2.CAP_V4L2)
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+    def configure(self, cap):
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if self.width and self.height:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            cap.set(cv2.CAP_PROP_FPS, self.fps)
+
+
+class VideoFileSource(CaptureSource):
+    """Recorded video replayed frame by frame, as fast as the consumer takes them"""
+
+    live = False
+
+    def __init__(self, path, loop=False):
+        super().__init__(path, label=f"Video: {os.path.basename(path)}")
+        self.path = path
+        self.loop = loop
+
+    def read(self):
+        ret, frame = super().read()
+        if not ret and self.loop and self.cap is not None:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            self.finished = True
+        return ret, frame
+
+
+class ImageDirSource(FrameSource):
+    """Directory of JPEGs replayed in sorted filename order"""
+
+    live = False
+
+    def __init__(self, directory, pattern="*.jpg", loop=False):
+        super().__init__(f"Images: {directory}")
+        self.directory = directory
+        self.pattern = pattern
+        self.loop = loop
+        self.paths = []
+        self.index = 0
+
+    def open(self):
+        self.paths = sorted(glob.glob(os.path.join(self.directory, self.pattern)))
+        self.index = 0
+        self.finished = False
+        return len(self.paths) > 0
+
+    def read(self):
+        if self.index >= len(self.paths):
+            if not self.loop or not self.paths:
+                self.finished = True
+                return False, None
+            self.index = 0
+        frame = cv2.imread(self.paths[self.index])
+        self.index += 1
+        return frame is not None, frame
+
+
+class SyntheticSource(FrameSource):
+    """In-memory frames: a list/iterable of frames, or a generated moving blob"""
+
+    live = False
+
+    def __init__(self, frames=None, num_frames=300, width=640, height=480, fps=None):
+        super().__init__("Synthetic")
+        self.frames = frames
+        self.num_frames = num_frames
+        self.width = width
+        self.height = height
+        self.fps = fps  # None = as fast as possible, otherwise pace like a camera
+        self.iterator = None
+        self.count = 0
+        self.last_time = 0
+
+    def open(self):
+        self.count = 0
+        self.finished = False
+        self.last_time = 0
+        self.iterator = iter(self.frames) if self.frames is not None else None
+        return True
+
+    def generate(self, index):
+        """Deterministic test frame: a bright blob sweeping side to side"""
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        x = int(self.width / 2 + self.width / 4 * np.sin(index * 0.5))
+        cv2.circle(frame, (x, self.height // 2), 40, (180, 200, 230), -1)
+        return frame
+
+    def read(self):
+        if self.fps:
+            wait = self.last_time + 1.0 / self.fps - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            self.last_time = time.time()
+
+        if self.iterator is not None:
+            frame = next(self.iterator, None)
+            if frame is None:
+                self.finished = True
+                return False, None
+            return True, frame
+
+        if self.count >= self.num_frames:
+            self.finished = True
+            return False, None
+        frame = self.generate(self.count)
+        self.count += 1
+        return True, frame
+
+
+def make_frame_source(spec):
+    """Build a frame source from a FrameSource, URL, device index/path, directory or file path"""
+    if isinstance(spec, FrameSource):
+        return spec
+    if spec is None:
+        raise ValueError("No frame source given: pass a camera URL, device index, video file or directory")
+    if isinstance(spec, int):
+        return DeviceSource(spec)
+
+    spec = str(spec)
+    if spec.startswith(("http://", "https://", "rtsp://")):
+        return IPCameraSource(spec)
+    if spec.isdigit() or spec.startswith("/dev/video"):
+        return DeviceSource(int(spec) if spec.isdigit() else spec)
+    if spec == "synthetic" or spec.startswith("synthetic:"):
+        count = spec.partition(":")[2]
+        return SyntheticSource(num_frames=int(count) if count else 300)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec)
+    return VideoFileSource(spec)
@@ -0,0 +1,111 @@
+import re
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+import http_client
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+# Sentence ends: . ? ! । and newlines, followed by whitespace (or end of reply)
+SENTENCE_END = re.compile(r"(?<=[.?!।\n])\s+")
+
+
+def stream_gemini(body, api_key, model="gemini-1.5-flash", base_url=GEMINI_BASE_URL):
+    """POST to :streamGenerateContent (SSE) and yield reply text chunks as they arrive"""
+    url = f"{base_url}/{model}:streamGenerateContent?alt=sse"
+    headers = {
+        "Content-Type": "application/json",
+        "X-goog-api-key": api_key
+    }
+    with http_client.post(url, endpoint="gemini", headers=headers, json=body, stream=True) as response:
+        if response.status_code != 200:
+            raise requests.HTTPError(f"Gemini API Error: {response.status_code} {response.text}")
+        for text in parse_sse_chunks(response.iter_lines(decode_unicode=True)):
+            yield text
+
+
+def parse_sse_chunks(lines):
+    """Reply text from Gemini SSE lines ('data: {...}')"""
+    for line in lines:
+        if not line or not line.startswith("data:"):
+            continue
+        payload = json.loads(line[5:].strip())
+        for candidate in payload.get("candidates", []):
+            for part in candidate.get("content", {}).get("parts", []):
+                if part.get("text"):
+                    yield part["text"]
+
+
+def split_sentences(chunks, min_length=8):
+    """Regroup streamed text chunks into sentences, yielding each one as soon as it is complete"""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        parts = SENTENCE_END.split(buffer)
+        # Last part may still be growing; very short sentences are merged with the next
+        ready, buffer = parts[:-1], parts[-1]
+        sentence = ""
+        for part in ready:
+            sentence = f"{sentence} {part}".strip()
+            if len(sentence) >= min_length:
+                yield sentence
+                sentence = ""
+        if sentence:
+            buffer = f"{sentence} {buffer}"
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class MockGeminiServer:
+    """Local stand-in for streamGenerateContent with the same SSE wire format, for tests"""
+
+    def __init__(self, reply="എന്താ ചേട്ടാ? വേറെ പണി ഒന്നും ഇല്ലേ? പോയി പഠിക്ക്.", chunk_size=12,
+                 chunk_delay=0.05, first_chunk_delay=0.3, port=0):
+        self.reply = reply
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.first_chunk_delay = first_chunk_delay
+        self.requests = []  # Request bodies received, for assertions
+
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                mock.requests.append(json.loads(self.rfile.read(length) or b"{}"))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                time.sleep(mock.first_chunk_delay)
+                for start in range(0, len(mock.reply), mock.chunk_size):
+                    chunk = {"candidates": [{"content": {"role": "model", "parts": [
+                        {"text": mock.reply[start:start + mock.chunk_size]}
+                    ]}}]}
+                    self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\r\n\r\n".encode())
+                    self.wfile.flush()
+                    time.sleep(mock.chunk_delay)
+                self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1beta/models"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+# kind: "wave" or "gun", hand_id: stable ID from the wave tracker (None if unknown)
+GestureEvent = namedtuple("GestureEvent", ["kind", "hand_id", "confidence", "timestamp", "frame_seq"])
+
+
+class Subscription:
+    """One subscriber: its own bounded queue and worker thread, so slow handlers only delay themselves"""
+
+    def __init__(self, handler, kinds=None, max_queue=16):
+        self.handler = handler
+        self.kinds = set(kinds) if kinds else None
+        self.queue = deque(maxlen=max_queue)  # Oldest events are dropped when full
+        self.condition = threading.Condition()
+        self.dropped = 0
+        self.active = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def offer(self, event):
+        if self.kinds and event.kind not in self.kinds:
+            return
+        with self.condition:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append(event)
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.queue or not self.active)
+                if not self.queue:
+                    return  # Closed and drained
+                event = self.queue.popleft()
+            try:
+                self.handler(event)
+            except Exception as e:
+                print(f"❌ Gesture handler error: {e}")
+
+    def close(self):
+        with self.condition:
+            self.active = False
+            self.condition.notify()
+
+
+class GestureEventBus:
+    """Publish gesture events from the vision loop without ever waiting on subscribers"""
+
+    def __init__(self, max_queue=16):
+        self.max_queue = max_queue
+        self.subscriptions = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, handler, kinds=None, max_queue=None):
+        """Call handler(event) on a background thread for every event (optionally only some kinds)"""
+        subscription = Subscription(handler, kinds, max_queue or self.max_queue)
+        with self.lock:
+            self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+        subscription.close()
+
+    def publish(self, kind, hand_id=None, confidence=1.0, frame_seq=0):
+        event = GestureEvent(kind, hand_id, confidence, time.time(), frame_seq)
+        for subscription in self.subscriptions:  # Copy-on-write list, no lock needed here
+            subscription.offer(event)
+        return event
+
+    def close(self):
+        with self.lock:
+            subscriptions, self.subscriptions = self.subscriptions, []
+        for subscription in subscriptions:
+            subscription.close()
@@ -0,0 +1,157 @@
+import time
+import random
+import asyncio
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Per-endpoint settings: timeout is (connect, read) seconds, retries are extra attempts.
+# Gemini read timeouts are not retried: a second 10 s wait is worse than the timeout reply.
+ENDPOINTS = {
+    "default": {"timeout": (3.05, 10), "retries": 2, "backoff": 0.3, "retry_read_timeout": True},
+    "gemini": {"timeout": (3.05, 10), "retries": 1, "backoff": 0.5, "retry_read_timeout": False},
+    "camera": {"timeout": (2, 5), "retries": 1, "backoff": 0.2, "retry_read_timeout": True},
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+POOL_SIZE = 8
+
+session = None
+session_lock = threading.Lock()
+
+
+def configure_endpoint(name, timeout=None, retries=None, backoff=None, retry_read_timeout=None):
+    """Add or change an endpoint's timeout / retry settings"""
+    settings = ENDPOINTS.setdefault(name, dict(ENDPOINTS["default"]))
+    if timeout is not None:
+        settings["timeout"] = timeout
+    if retries is not None:
+        settings["retries"] = retries
+    if backoff is not None:
+        settings["backoff"] = backoff
+    if retry_read_timeout is not None:
+        settings["retry_read_timeout"] = retry_read_timeout
+    return settings
+
+
+def configure_pool(pool_size):
+    """Change the keep-alive pool size (takes effect for the next session created)"""
+    global POOL_SIZE, session
+    with session_lock:
+        POOL_SIZE = pool_size
+        if session is not None:
+            session.close()
+            session = None
+
+
+def get_session():
+    """Shared keep-alive session: connections (and TLS) are reused across calls and threads"""
+    global session
+    if session is None:
+        with session_lock:
+            if session is None:
+                new_session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                new_session.mount("http://", adapter)
+                new_session.mount("https://", adapter)
+                session = new_session
+    return session
+
+
+def backoff_delay(attempt, backoff):
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, backoff * (2 ** attempt))
+
+
+def request(method, url, endpoint="default", **kwargs):
+    """session.request with the endpoint's timeout and retries on connection errors, 429/5xx
+    and (unless the endpoint turns it off) read timeouts"""
+    settings = ENDPOINTS.get(endpoint, ENDPOINTS["default"])
+    kwargs.setdefault("timeout", settings["timeout"])
+
+    for attempt in range(settings["retries"] + 1):
+        last_attempt = attempt == settings["retries"]
+        try:
+            response = get_session().request(method, url, **kwargs)
+        except requests.exceptions.ReadTimeout:
+            if last_attempt or not settings["retry_read_timeout"]:
+                raise
+        except requests.exceptions.ConnectionError:  # Includes ConnectTimeout
+            if last_attempt:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS or last_attempt:
+                return response
+            response.close()
+        time.sleep(backoff_delay(attempt, settings["backoff"]))
+
+
+def get(url, endpoint="default", **kwargs):
+    return request("GET", url, endpoint, **kwargs)
+
+
+def post(url, endpoint="default", **kwargs):
+    return request("POST", url, endpoint, **kwargs)
+
+
+def preconnect(url, endpoint="default"):
+    """Open (and keep) a connection to a host ahead of the first real call"""
+    try:
+        request("HEAD", url, endpoint, allow_redirects=False).close()
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️  Pre-connect to {url} failed: {e}")
+        return False
+
+
+class AsyncHTTPClient:
+    """aiohttp counterpart of the shared session, one pooled session per event loop"""
+
+    def __init__(self, pool_size=None):
+        self.pool_size = pool_size or POOL_SIZE
+        self.sessions = {}  # event loop -> aiohttp.ClientSession
+
+    def get_session(self):
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        client_session = self.sessions.get(loop)
+        if client_session is None or client_session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            client_session = aiohttp.ClientSession(connector=connector)
+            self.sessions[loop] = client_session
+        return client_session
+
+    async def request(self, method, url, endpoint="default", **kwargs):
+        """Like request() above; returns an aiohttp response (read it before the next call)"""
+        import aiohttp
+
+        settings = ENDPOINTS.get(endpoint, ENDPOINTS["default"])
+        connect, read = settings["timeout"]
+        kwargs.setdefault("timeout", aiohttp.ClientTimeout(sock_connect=connect, sock_read=read))
+
+        for attempt in range(settings["retries"] + 1):
+            last_attempt = attempt == settings["retries"]
+            try:
+                response = await self.get_session().request(method, url, **kwargs)
+            except asyncio.TimeoutError as e:
+                # Connect timeouts are always retried (ConnectionTimeoutError needs aiohttp 3.10)
+                connect_timeout = isinstance(e, getattr(aiohttp, "ConnectionTimeoutError", ()))
+                if last_attempt or not (connect_timeout or settings["retry_read_timeout"]):
+                    raise
+            except aiohttp.ClientConnectionError:
+                if last_attempt:
+                    raise
+            else:
+                if response.status not in RETRY_STATUS or last_attempt:
+                    return response
+                response.release()
+            await asyncio.sleep(backoff_delay(attempt, settings["backoff"]))
+
+    async def close(self):
+        for client_session in self.sessions.values():
+            await client_session.close()
+        self.sessions.clear()
+
+
+async_client = AsyncHTTPClient()
@@ -0,0 +1,167 @@
+import multiprocessing as mp_proc
+from multiprocessing import shared_memory
+from collections import deque
+import queue
+import numpy as np
+
+
+class InferenceWorkerError(RuntimeError):
+    """A worker process died or stopped answering; outstanding frames will not come back"""
+
+
+def inference_worker(task_queue, result_queue, slot_names, max_num_hands, static_image_mode):
+    """Worker process: read BGR frames from shared memory, return (hands, 21, 3) landmark arrays"""
+    import cv2
+    import mediapipe as mp
+    from face import landmarks_to_array, NUM_HAND_LANDMARKS
+
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=max_num_hands,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.5
+    )
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            seq, slot, shape = task
+            try:
+                frame = np.ndarray(shape, dtype=np.uint8, buffer=slots[slot].buf)
+                results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                if results.multi_hand_landmarks:
+                    hand_points = landmarks_to_array(results.multi_hand_landmarks)
+                else:
+                    hand_points = np.zeros((0, NUM_HAND_LANDMARKS, 3), dtype=np.float32)
+            except Exception as e:
+                print(f"❌ Inference worker error: {e}")
+                hand_points = np.zeros((0, NUM_HAND_LANDMARKS, 3), dtype=np.float32)
+            result_queue.put((seq, slot, hand_points))
+    finally:
+        hands.close()
+        for shm in slots:
+            shm.close()
+
+
+class HandInferencePool:
+    """Run MediaPipe hand inference in worker processes, results come back in submission order
+
+    Frames go through a fixed set of shared memory slots (no pickling of pixels), only the
+    small landmark arrays travel back over the result queue.
+    """
+
+    def __init__(self, num_workers=2, max_frame_shape=(720, 1280, 3), max_num_hands=2,
+                 slots_per_worker=2, start_method=None, result_timeout=30.0, poll_interval=0.5):
+        self.num_workers = num_workers
+        self.max_frame_shape = max_frame_shape
+        self.max_num_hands = max_num_hands
+        self.num_slots = num_workers * slots_per_worker
+        self.context = mp_proc.get_context(start_method)
+        self.result_timeout = result_timeout  # Longest wait for a result (first frame includes model loading)
+        self.poll_interval = poll_interval  # How often a blocked wait checks that the workers are alive
+
+        self.slots = []
+        self.free_slots = deque()
+        self.workers = []
+        self.task_queue = None
+        self.result_queue = None
+
+        # Reordering: results may finish out of order across workers
+        self.submitted = deque()  # seqs in submission order
+        self.completed = {}       # seq -> hand_points
+        self.running = False
+
+    def start(self):
+        slot_size = int(np.prod(self.max_frame_shape))
+        self.slots = [shared_memory.SharedMemory(create=True, size=slot_size) for _ in range(self.num_slots)]
+        self.free_slots = deque(range(self.num_slots))
+        self.task_queue = self.context.Queue()
+        self.result_queue = self.context.Queue()
+
+        # Each worker only sees some of the frames, so MediaPipe tracking mode would lose
+        # track between them; use per-image detection when there is more than one worker
+        static_image_mode = self.num_workers > 1
+        slot_names = [shm.name for shm in self.slots]
+        for _ in range(self.num_workers):
+            worker = self.context.Process(
+                target=inference_worker,
+                args=(self.task_queue, self.result_queue, slot_names, self.max_num_hands, static_image_mode),
+                daemon=True
+            )
+            worker.start()
+            self.workers.append(worker)
+
+        self.running = True
+        print(f"⚙️  Hand inference pool started with {self.num_workers} worker(s)")
+
+    def receive(self, timeout=None):
+        """Move one finished result into the reorder buffer, returns False on timeout"""
+        try:
+            seq, slot, hand_points = self.result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        self.free_slots.append(slot)
+        self.completed[seq] = hand_points
+        return True
+
+    def wait_for_result(self):
+        """receive() that raises InferenceWorkerError instead of waiting forever on a dead worker"""
+        waited = 0.0
+        while not self.receive(timeout=self.poll_interval):
+            dead = [worker for worker in self.workers if not worker.is_alive()]
+            if dead:
+                raise InferenceWorkerError(f"Inference worker died (exit code {dead[0].exitcode})")
+            waited += self.poll_interval
+            if waited >= self.result_timeout:
+                raise InferenceWorkerError(f"No inference result for {waited:.0f}s")
+
+    def submit(self, seq, frame):
+        """Copy a BGR frame into a free slot and queue it, waits while every slot is busy"""
+        if frame.nbytes > self.slots[0].size:
+            raise ValueError(f"Frame {frame.shape} larger than inference slot {self.max_frame_shape}")
+
+        while not self.free_slots:
+            self.wait_for_result()
+
+        slot = self.free_slots.popleft()
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.slots[slot].buf)
+        view[:] = frame
+        self.submitted.append(seq)
+        self.task_queue.put((seq, slot, frame.shape))
+
+    def collect(self):
+        """Results that are ready, in submission order: list of (seq, hand_points)"""
+        while self.receive(timeout=0):
+            pass
+        ready = []
+        while self.submitted and self.submitted[0] in self.completed:
+            seq = self.submitted.popleft()
+            ready.append((seq, self.completed.pop(seq)))
+        return ready
+
+    def drain(self):
+        """Wait for every outstanding frame, results in submission order"""
+        while len(self.completed) < len(self.submitted):
+            self.wait_for_result()
+        return self.collect()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        for _ in self.workers:
+            self.task_queue.put(None)
+        for worker in self.workers:
+            worker.join(timeout=2)
+            if worker.is_alive():
+                worker.terminate()
+        self.workers = []
+        for shm in self.slots:
+            shm.close()
+            shm.unlink()
+        self.slots = []
+        self.submitted.clear()
+        self.completed.clear()
@@ -0,0 +1,178 @@
+from collections import deque, namedtuple
+from response_cache import normalize_utterance
+
+# keyword is the normalized keyword that matched; fuzzy is True for the edit-distance tier
+IntentMatch = namedtuple("IntentMatch", "intent keyword fuzzy handler")
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton: finds every keyword in one pass over the text
+
+    Dispatch cost depends on the text length, not on how many keywords are registered.
+    """
+
+    def __init__(self):
+        self.goto = [{}]  # state -> {char: next state}
+        self.fail = [0]
+        self.output = [[]]  # state -> values of keywords ending here
+        self.built = True
+
+    def add(self, keyword, value):
+        state = 0
+        for char in keyword:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append(value)
+        self.built = False
+
+    def build(self):
+        """Compute failure links (breadth first)"""
+        queue = deque(self.goto[0].values())
+        for state in queue:
+            self.fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+        self.built = True
+
+    def find(self, text):
+        """Yield (end index, value) for every keyword occurrence"""
+        if not self.built:
+            self.build()
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for value in self.output[state]:
+                yield index + 1, value
+
+
+def bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 as soon as it is known to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class IntentRouter:
+    """Keyword intents with handlers and priorities, matched on normalized text
+
+    Exact tier: every keyword (Malayalam, English, transliterations) in one automaton;
+    a match must start at a word boundary, so Malayalam suffixes (ക്യാമറയിൽ) still match.
+    Fuzzy tier: words within a small edit distance of a keyword, for common
+    misrecognitions. Both tiers compete: higher priority wins, then the longer keyword,
+    then an exact match, so "ക്യാമറ നിർത്തൂ" is stop_camera even though "ക്യാമറ" is exact.
+    Short Latin keywords (up to `short_latin_length` letters) are exact only: one edit
+    away from "helo" are "help", "held" and "hero".
+    """
+
+    def __init__(self, max_edits=1, long_word_edits=2, long_word_length=8, short_latin_length=5):
+        self.intents = {}  # intent -> (handler, priority)
+        self.keywords = {}  # normalized keyword -> intent
+        self.fuzzy_keywords = {}  # word count -> [(keyword, intent, bigrams)]
+        self.automaton = KeywordAutomaton()
+        self.max_edits = max_edits
+        self.long_word_edits = long_word_edits
+        self.long_word_length = long_word_length
+        self.short_latin_length = short_latin_length
+
+    def register(self, intent, keywords, handler, priority=0, fuzzy=True):
+        self.intents[intent] = (handler, priority)
+        for keyword in keywords:
+            keyword = normalize_utterance(keyword)
+            if not keyword or keyword in self.keywords:
+                continue
+            self.keywords[keyword] = intent
+            self.automaton.add(keyword, keyword)
+            if fuzzy and self.fuzzy_allowed(keyword):
+                self.fuzzy_keywords.setdefault(len(keyword.split()), []).append((keyword, intent, bigrams(keyword)))
+
+    def fuzzy_allowed(self, keyword):
+        if keyword.isascii() and len(keyword) <= self.short_latin_length:
+            return False
+        return len(keyword) >= 4
+
+    def allowed_edits(self, keyword):
+        return self.long_word_edits if len(keyword) >= self.long_word_length else self.max_edits
+
+    def rank(self, intent, keyword, fuzzy):
+        return self.intents[intent][1], len(keyword), not fuzzy
+
+    def best(self, candidates):
+        if not candidates:
+            return None
+        intent, keyword, fuzzy = max(candidates, key=lambda candidate: self.rank(*candidate))
+        return IntentMatch(intent, keyword, fuzzy, self.intents[intent][0])
+
+    def match_exact(self, text):
+        """(intent, keyword, False) for every keyword starting at a word boundary"""
+        candidates = []
+        for end, keyword in self.automaton.find(text):
+            start = end - len(keyword)
+            if start == 0 or text[start - 1] == " ":
+                candidates.append((self.keywords[keyword], keyword, False))
+        return candidates
+
+    def match_fuzzy(self, text):
+        """(intent, keyword, True) for every run of words close to a keyword"""
+        words = text.split()
+        candidates = []
+        for count, keywords in self.fuzzy_keywords.items():
+            for start in range(len(words) - count + 1):
+                phrase = " ".join(words[start:start + count])
+                phrase_bigrams = bigrams(phrase)
+                for keyword, intent, keyword_bigrams in keywords:
+                    edits = self.allowed_edits(keyword)
+                    # Each edit breaks at most two bigrams: cheap reject before the DP
+                    if abs(len(phrase) - len(keyword)) > edits or \
+                            len(keyword_bigrams & phrase_bigrams) < len(keyword_bigrams) - 2 * edits:
+                        continue
+                    if edit_distance(phrase, keyword, edits) <= edits:
+                        candidates.append((intent, keyword, True))
+        return candidates
+
+    def incomplete(self, text, match):
+        """True if more words could still turn the match into a higher-priority keyword
+
+        For partial results: "camera" may be the start of "camera off".
+        """
+        text = normalize_utterance(text)
+        start = text.rfind(match.keyword)
+        if start < 0:
+            return False
+        heard = text[start:]
+        priority = self.intents[match.intent][1]
+        return any(keyword != heard and keyword.startswith(heard) and self.intents[intent][1] > priority
+                   for keyword, intent in self.keywords.items())
+
+    def route(self, text):
+        """Best IntentMatch for an utterance, or None if it should go to Gemini"""
+        text = normalize_utterance(text)
+        if not text:
+            return None
+        return self.best(self.match_exact(text) + self.match_fuzzy(text))
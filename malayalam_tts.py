@@ -1,22 +1,27 @@
-import os
 import asyncio
-import edge_tts
+from tts_cache import TTSCache
+from tts_service import get_tts_service
 
-async def speak_malayalam_async(text):
-    # Use a male Malayalam neural voice with fast, expressive tone
-    voice = "ml-IN-MidhunNeural"
-    communicate = edge_tts.Communicate(
-        text,
-        voice=voice,
-        rate="+25%",      # Faster speed for energetic delivery
-        pitch="+0Hz"      # Neutral pitch
-    )
-    filename = "malayalam_output.mp3"
-    try:
-        await communicate.save(filename)
-        os.system(f"mpg123 {filename} || ffplay -nodisp -autoexit {filename} || afplay {filename}")
-    except edge_tts.exceptions.NoAudioReceived:
-        print(f"No audio received from edge-tts for voice '{voice}'. Try updating edge-tts or using a different voice.")
+# Use a male Malayalam neural voice with fast, expressive tone
+VOICE = "ml-IN-MidhunNeural"
+RATE = "+25%"      # Faster speed for energetic delivery
+PITCH = "+0Hz"     # Neutral pitch
+
+# Shared by every speaker: same text + voice settings = same file, synthesized once
+tts_cache = TTSCache("tts_cache")
+
+async def synthesize_malayalam(text):
+    """Path to an MP3 of this text (from the cache when it was said before)"""
+    return await asyncio.wrap_future(get_tts_service().synthesize(text, VOICE, RATE, PITCH))
+
+def warm_up_malayalam(phrases):
+    """Pre-synthesize phrases in the background so they play instantly later"""
+    return get_tts_service().warm_up(phrases, VOICE, RATE, PITCH)
 
 def speak_malayalam(text):
-    asyncio.run(speak_malayalam_async(text))
+    """Queue text to be spoken, returns an Utterance handle right away"""
+    return get_tts_service().submit(text, VOICE, RATE, PITCH)
+
+async def speak_malayalam_async(text):
+    """Speak text and wait until it has been played"""
+    return await asyncio.wrap_future(speak_malayalam(text).future)
@@ -7,9 +7,57 @@
 #define OLED_RESET     -1
 Adafruit_SSD1306 display(SCREEN_WIDTH, SCREEN_HEIGHT, &Wire, OLED_RESET);
 
+// Binary frames from the host (oled_protocol.py):
+// START, command, payload length, payload..., checksum (XOR of command, length, payload)
+#define FRAME_START 0xA5
+#define MAX_PAYLOAD 8
+#define CMD_EMOTION 0x01   // emotion, speed %, loops (0 = default)
+#define CMD_SET_BAUD 0x02  // baud rate, 4 bytes little-endian
+#define CMD_PING 0x03
+#define CMD_IDENTIFY 0x04
+#define RSP_ACK 0x81
+#define RSP_READY 0x82
+#define RSP_BAUD_OK 0x83
+#define RSP_IDENTITY 0x84  // "OLED" + firmware version, so the host can tell this board from others
+#define RSP_ERROR 0x8F
+#define DEFAULT_BAUD 9600
+#define BAUD_CONFIRM_MS 1000  // Fall back to DEFAULT_BAUD if no ping arrives at the new rate (oled_protocol.py)
+#define FIRMWARE_VERSION 1
+
+enum ParseState { WAIT_START, READ_COMMAND, READ_LENGTH, READ_PAYLOAD, READ_CHECKSUM };
+ParseState parseState = WAIT_START;
+uint8_t frameCommand, frameLength, frameIndex, frameChecksum;
+uint8_t framePayload[MAX_PAYLOAD];
+bool baudPending = false;
+unsigned long baudChangedAt = 0;
+
+uint8_t animSpeed = 100;  // Percent, 200 = twice as fast
+uint8_t animLoops = 0;    // 0 = the animation's own repeat count
+
+// delay() scaled by the requested animation speed
+void pause(unsigned long ms) {
+  delay(ms * 100 / animSpeed);
+}
+
+int loopsOr(int defaultLoops) {
+  return animLoops > 0 ? animLoops : defaultLoops;
+}
+
+void sendFrame(uint8_t command, const uint8_t *payload, uint8_t length) {
+  uint8_t checksum = command ^ length;
+  Serial.write(FRAME_START);
+  Serial.write(command);
+  Serial.write(length);
+  for (uint8_t i = 0; i < length; i++) {
+    Serial.write(payload[i]);
+    checksum ^= payload[i];
+  }
+  Serial.write(checksum);
+}
+
 // 👁 Blink Animation
 void animateBlink() {
-  for (int blink = 0; blink < 3; blink++) {
+  for (int blink = 0; blink < loopsOr(3); blink++) {
     // Eyes open - crescent style
     display.clearDisplay();
 
@@ -22,7 +70,7 @@ void animateBlink() {
     display.fillCircle(88, 38, 15, SSD1306_BLACK);
 
     display.display();
-    delay(800);
+    pause(800);
 
     // Eyes closed - line style
     display.clearDisplay();
@@ -30,13 +78,13 @@ void animateBlink() {
     display.drawLine(73, 32, 103, 32, SSD1306_WHITE); // right closed
 
     display.display();
-    delay(200);
+    pause(200);
   }
 }
 
 // 👋 Hand Wave Animation
 void animateWave() {
-  for (int wave = 0; wave < 3; wave++) {
+  for (int wave = 0; wave < loopsOr(3); wave++) {
     // Frame 1 - hand up
     display.clearDisplay();
 
@@ -51,7 +99,7 @@ void animateWave() {
     display.drawLine(100, 25, 110, 15, SSD1306_WHITE);   // arm
 
     display.display();
-    delay(300);
+    pause(300);
 
     // Frame 2 - hand down
     display.clearDisplay();
@@ -67,13 +115,13 @@ void animateWave() {
     display.drawLine(100, 25, 110, 30, SSD1306_WHITE);   // arm
 
     display.display();
-    delay(300);
+    pause(300);
   }
 }
 
 
 void animateEmoGun() {
-  for (int pose = 0; pose < 3; pose++) {
+  for (int pose = 0; pose < loopsOr(3); pose++) {
     // Sad/emo eyes with gun pose
     display.clearDisplay();
     
@@ -102,7 +150,7 @@ void animateEmoGun() {
     display.print("why even try...");
     
     display.display();
-    delay(1500);
+    pause(1500);
     
     // Shaking/trembling effect
     display.clearDisplay();
@@ -127,7 +175,7 @@ void animateEmoGun() {
     display.print("i can't do it");
     
     display.display();
-    delay(800);
+    pause(800);
     
     // Gun lowered, ultimate sadness
     display.clearDisplay();
@@ -152,7 +200,7 @@ void animateEmoGun() {
     display.print("existence is pain");
     
     display.display();
-    delay(2000);
+    pause(2000);
   }
   
   // Return to normal sad state
@@ -179,10 +227,11 @@ void setup() {
   display.println("OLED Ready ✅");
   display.display();
   delay(1000);
+  Serial.println("Ready");  // Boot banner: the host waits for this instead of sleeping
 }
 
 void animateBlast() {
-  for (int blast = 0; blast < 2; blast++) {
+  for (int blast = 0; blast < loopsOr(2); blast++) {
     // Pre-blast - charging up
     display.clearDisplay();
     
@@ -197,7 +246,7 @@ void animateBlast() {
     display.fillCircle(105, 20, 2, SSD1306_WHITE);
     
     display.display();
-    delay(300);
+    pause(300);
     
     // Blast frame 1 - initial explosion
     display.clearDisplay();
@@ -226,7 +275,7 @@ void animateBlast() {
     display.fillCircle(118, 55, 3, SSD1306_WHITE);
     
     display.display();
-    delay(200);
+    pause(200);
     
     // Blast frame 2 - expanding explosion
     display.clearDisplay();
@@ -251,7 +300,7 @@ void animateBlast() {
     display.fillRect(95, 15, 2, 2, SSD1306_WHITE);
     
     display.display();
-    delay(200);
+    pause(200);
     
     // Blast frame 3 - maximum explosion
     display.clearDisplay();
@@ -269,7 +318,7 @@ void animateBlast() {
     display.print("BOOM");
     
     display.display();
-    delay(400);
+    pause(400);
     
     // Blast frame 4 - smoke/aftermath
     display.clearDisplay();
@@ -293,42 +342,138 @@ void animateBlast() {
     display.fillCircle(80, 10, 1, SSD1306_WHITE);
     
     display.display();
-    delay(600);
+    pause(600);
     
     // Clear aftermath
     display.clearDisplay();
     display.display();
-    delay(300);
+    pause(300);
   }
 }
 
-void loop() {
-   if (Serial.available() > 0) {
-    int command = Serial.parseInt();
-    
-    switch(command) {
-      case 1:
-        Serial.println("Executing: Blink");
-        animateBlink();
-        break;
-      case 4:
-        animateBlast();
-        break;
-      case 2:
-        animateWave();
-        break;
-      default:
-        animateBlink();
-        if(command != 0) {
-          Serial.println("Invalid command. Use 1-5");
-        }
-        break;
-    }
-  while(Serial.available() > 0) {
-      Serial.read();
-    }
+void playEmotion(int emotion) {
+  switch(emotion) {
+    case 1:
+      animateBlink();
+      break;
+    case 4:
+      animateBlast();
+      break;
+    case 2:
+      animateWave();
+      break;
+    default:
+      animateBlink();
+      break;
+  }
+}
+
+// After every emotion: back to the resting face (Blast ends on a blank screen)
+void restingFace() {
   animateBlink();  // 👁 Blink animation
-  delay(1000);
+  pause(1000);
+}
+
+void handleFrame() {
+  switch(frameCommand) {
+    case CMD_EMOTION:
+      sendFrame(RSP_ACK, &frameCommand, 1);
+      animSpeed = (frameLength > 1 && framePayload[1] > 0) ? framePayload[1] : 100;
+      animLoops = frameLength > 2 ? framePayload[2] : 0;
+      playEmotion(frameLength > 0 ? framePayload[0] : 1);
+      animSpeed = 100;
+      animLoops = 0;
+      restingFace();
+      sendFrame(RSP_READY, NULL, 0);
+      break;
+    case CMD_SET_BAUD:
+      if (frameLength == 4) {
+        unsigned long baud = (unsigned long)framePayload[0] | ((unsigned long)framePayload[1] << 8) |
+                             ((unsigned long)framePayload[2] << 16) | ((unsigned long)framePayload[3] << 24);
+        sendFrame(RSP_BAUD_OK, framePayload, 4);
+        Serial.flush();  // Reply goes out at the old rate
+        Serial.end();
+        Serial.begin(baud);
+        baudPending = baud != DEFAULT_BAUD;
+        baudChangedAt = millis();
+      } else {
+        sendFrame(RSP_ERROR, &frameCommand, 1);
+      }
+      break;
+    case CMD_PING:
+      baudPending = false;  // Host can hear us at this rate
+      sendFrame(RSP_ACK, &frameCommand, 1);
+      break;
+    case CMD_IDENTIFY: {
+      const uint8_t identity[] = {'O', 'L', 'E', 'D', FIRMWARE_VERSION};
+      sendFrame(RSP_IDENTITY, identity, sizeof(identity));
+      break;
+    }
+    default:
+      sendFrame(RSP_ERROR, &frameCommand, 1);
+      break;
+  }
+}
+
+// Feed one byte, returns true when a complete frame with a valid checksum has arrived
+bool parseByte(uint8_t b) {
+  switch(parseState) {
+    case WAIT_START:
+      if (b == FRAME_START) parseState = READ_COMMAND;
+      return false;
+    case READ_COMMAND:
+      frameCommand = b;
+      frameChecksum = b;
+      parseState = READ_LENGTH;
+      return false;
+    case READ_LENGTH:
+      if (b > MAX_PAYLOAD) {
+        parseState = WAIT_START;
+        return false;
+      }
+      frameLength = b;
+      frameChecksum ^= b;
+      frameIndex = 0;
+      parseState = b > 0 ? READ_PAYLOAD : READ_CHECKSUM;
+      return false;
+    case READ_PAYLOAD:
+      framePayload[frameIndex++] = b;
+      frameChecksum ^= b;
+      if (frameIndex >= frameLength) parseState = READ_CHECKSUM;
+      return false;
+    case READ_CHECKSUM:
+      parseState = WAIT_START;
+      return b == frameChecksum;
+  }
+  return false;
+}
 
+// Old text commands ("3\n") still work, answered with text
+void handleTextCommand(int command) {
+  Serial.print("Executing: ");
+  Serial.println(command);
+  playEmotion(command);
+  if (command > 5) {
+    Serial.println("Invalid command. Use 1-5");
+  }
+  restingFace();
+  Serial.println("Ready");
+}
+
+void loop() {
+  // Bytes are handled as they arrive: no parseInt() timeout
+  while (Serial.available() > 0) {
+    uint8_t b = Serial.read();
+    if (parseState == WAIT_START && b >= '1' && b <= '9') {
+      handleTextCommand(b - '0');
+    } else if (parseByte(b)) {
+      handleFrame();
+    }
+  }
 
-}}
+  if (baudPending && millis() - baudChangedAt > BAUD_CONFIRM_MS) {
+    Serial.end();
+    Serial.begin(DEFAULT_BAUD);
+    baudPending = false;
+  }
+}
@@ -0,0 +1,109 @@
+from collections import namedtuple
+
+# Frame: START, command, payload length, payload..., checksum (XOR of command, length, payload)
+FRAME_START = 0xA5
+MAX_PAYLOAD = 8
+
+# Host -> sketch
+CMD_EMOTION = 0x01  # payload: emotion code, speed in percent (100 = normal), loops (0 = default)
+CMD_SET_BAUD = 0x02  # payload: baud rate, 4 bytes little-endian
+CMD_PING = 0x03
+CMD_IDENTIFY = 0x04
+
+# Sketch -> host
+RSP_ACK = 0x81  # payload: command that was received
+RSP_READY = 0x82  # animation finished, next command can be sent
+RSP_BAUD_OK = 0x83  # payload: baud rate the sketch is switching to
+RSP_IDENTITY = 0x84  # payload: DEVICE_ID + firmware version byte
+RSP_ERROR = 0x8F  # payload: command that was rejected
+
+DEVICE_ID = b"OLED"
+
+DEFAULT_BAUD = 9600
+FAST_BAUD = 115200
+BAUD_CONFIRM_MS = 1000  # The sketch goes back to DEFAULT_BAUD if no ping arrives at the new rate within this
+
+Frame = namedtuple("Frame", "command payload")
+
+
+def checksum(command, payload):
+    value = command ^ len(payload)
+    for byte in payload:
+        value ^= byte
+    return value
+
+
+def encode_frame(command, payload=b""):
+    payload = bytes(payload)
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Payload too long: {len(payload)} > {MAX_PAYLOAD}")
+    return bytes([FRAME_START, command, len(payload)]) + payload + bytes([checksum(command, payload)])
+
+
+def emotion_frame(emotion, speed=100, loops=0):
+    """Play an emotion animation; speed 200 runs it twice as fast, loops 0 keeps its own count"""
+    return encode_frame(CMD_EMOTION, [int(emotion), max(1, min(int(speed), 255)), max(0, min(int(loops), 255))])
+
+
+def baud_frame(baud):
+    return encode_frame(CMD_SET_BAUD, int(baud).to_bytes(4, "little"))
+
+
+def ping_frame():
+    return encode_frame(CMD_PING)
+
+
+def identify_frame():
+    return encode_frame(CMD_IDENTIFY)
+
+
+class FrameDecoder:
+    """Incremental decoder for bytes from the sketch
+
+    feed() returns complete Frames plus any plain text lines printed outside frames
+    (debug output such as "SSD1306 failed"). A bad frame is dropped and decoding
+    resumes at the next start byte.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()  # Current frame, starting with FRAME_START
+        self.text = bytearray()
+        self.bad_frames = 0
+
+    def feed(self, data):
+        items = []
+        for byte in data:
+            if self.buffer:
+                self.buffer.append(byte)
+                frame = self.complete_frame()
+                if frame is not None:
+                    items.append(frame)
+            elif byte == FRAME_START:
+                self.buffer.append(byte)
+            elif byte == 0x0A:  # \n
+                line = self.text.decode(errors="replace").strip()
+                self.text.clear()
+                if line:
+                    items.append(line)
+            else:
+                self.text.append(byte)
+        return items
+
+    def complete_frame(self):
+        """Frame once the buffer holds a whole one, None while more bytes are needed"""
+        if len(self.buffer) < 3:
+            return None
+        command, length = self.buffer[1], self.buffer[2]
+        if length > MAX_PAYLOAD:
+            self.buffer.clear()  # Not a real frame start, wait for the next one
+            self.bad_frames += 1
+            return None
+        if len(self.buffer) < 4 + length:
+            return None
+        payload = bytes(self.buffer[3:3 + length])
+        valid = self.buffer[3 + length] == checksum(command, payload)
+        self.buffer.clear()
+        if not valid:
+            self.bad_frames += 1
+            return None
+        return Frame(command, payload)
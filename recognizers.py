@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import concurrent.futures
+import speech_recognition as sr
+
+SAMPLE_RATE = 16000  # Local models want 16 kHz mono int16
+
+
+class RecognizerUnavailable(Exception):
+    """Backend cannot be used right now (network down, model missing, ...)"""
+
+
+class SpeechRecognizer:
+    """Speech-to-text backend: recognize(audio) -> text or None
+
+    Raises RecognizerUnavailable when the backend itself failed, so a fallback can take over.
+    Backends with `streaming = True` also offer start_stream() for partial results.
+    """
+
+    name = "base"
+    streaming = False
+
+    def recognize(self, audio):
+        raise NotImplementedError
+
+    def start_stream(self):
+        raise NotImplementedError
+
+
+class GoogleRecognizer(SpeechRecognizer):
+    """Google Web Speech API through speech_recognition (needs network)"""
+
+    name = "google"
+
+    def __init__(self, language="ml-IN", timeout=5):
+        self.language = language
+        self.recognizer = sr.Recognizer()
+        self.recognizer.operation_timeout = timeout
+
+    def recognize(self, audio):
+        try:
+            return self.recognizer.recognize_google(audio, language=self.language)
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            raise RecognizerUnavailable(f"Google: {e}")
+
+
+class VoskStream:
+    """Incremental recognition of one utterance: feed() frames, finish() for the final text"""
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.last_partial = ""
+
+    def feed(self, frame):
+        """Feed raw 16 kHz int16 audio, returns new partial text (or None if unchanged)"""
+        if self.recognizer.AcceptWaveform(frame):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        if text and text != self.last_partial:
+            self.last_partial = text
+            return text
+        return None
+
+    def finish(self):
+        return json.loads(self.recognizer.FinalResult()).get("text", "") or None
+
+
+class VoskRecognizer(SpeechRecognizer):
+    """Offline Kaldi recognizer (pip install vosk), runs on the board's CPU with streaming partials"""
+
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_path):
+        try:
+            import vosk
+        except ImportError:
+            raise RecognizerUnavailable("vosk is not installed (pip install vosk)")
+        if not os.path.isdir(model_path):
+            raise RecognizerUnavailable(f"Vosk model not found at {model_path}")
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)  # Loaded once, shared by every utterance
+
+    def start_stream(self):
+        return VoskStream(self.vosk.KaldiRecognizer(self.model, SAMPLE_RATE))
+
+    def recognize(self, audio):
+        # The microphone may already have transcribed this segment while it was being spoken
+        transcript = getattr(audio, "transcript", None)
+        if transcript:
+            return transcript
+        stream = self.start_stream()
+        stream.feed(audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))
+        return stream.finish()
+
+
+class WhisperRecognizer(SpeechRecognizer):
+    """Offline Whisper on CPU via faster-whisper (pip install faster-whisper), final results only"""
+
+    name = "whisper"
+
+    def __init__(self, model_size="base", language="ml", compute_type="int8"):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RecognizerUnavailable("faster-whisper is not installed (pip install faster-whisper)")
+        import numpy as np
+
+        self.np = np
+        self.language = language
+        self.model = WhisperModel(model_size, device="cpu", compute_type=compute_type)
+
+    def recognize(self, audio):
+        transcript = getattr(audio, "transcript", None)
+        if transcript:
+            return transcript
+        raw = audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+        samples = self.np.frombuffer(raw, dtype=self.np.int16).astype(self.np.float32) / 32768.0
+        segments, _ = self.model.transcribe(samples, language=self.language, beam_size=1)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        return text or None
+
+
+class FallbackRecognizer(SpeechRecognizer):
+    """Try backends in order; move on when one fails or takes longer than `slow_after` seconds
+
+    A backend that failed, or was slow `slow_strikes` times in a row, is skipped for
+    `retry_after` seconds, so a dropped Wi-Fi costs one timeout instead of one per
+    utterance. A single slow cloud reply (well within its own timeout) only moves that
+    one utterance to the next backend.
+    """
+
+    name = "fallback"
+
+    def __init__(self, backends, slow_after=2.5, retry_after=30, slow_strikes=3):
+        self.backends = backends
+        self.slow_after = slow_after
+        self.retry_after = retry_after
+        self.slow_strikes = slow_strikes
+        self.down_until = {}  # backend name -> time it may be tried again
+        self.slow_calls = {}  # backend name -> slow calls in a row
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(backends) + 1)
+        self.last_backend = None
+
+    @property
+    def streaming(self):
+        return self.stream_backend() is not None
+
+    def stream_backend(self):
+        return next((backend for backend in self.backends if backend.streaming), None)
+
+    def start_stream(self):
+        return self.stream_backend().start_stream()
+
+    def recognize(self, audio):
+        now = time.time()
+        candidates = [b for b in self.backends if self.down_until.get(b.name, 0) <= now] or self.backends
+        for index, backend in enumerate(candidates):
+            last = index == len(candidates) - 1
+            future = self.executor.submit(backend.recognize, audio)
+            try:
+                text = future.result(timeout=None if last else self.slow_after)
+                self.last_backend = backend.name
+                self.slow_calls[backend.name] = 0
+                return text
+            except concurrent.futures.TimeoutError:
+                self.slow_calls[backend.name] = self.slow_calls.get(backend.name, 0) + 1
+                print(f"🐢 {backend.name} is slow ({self.slow_calls[backend.name]} in a row), falling back")
+                if self.slow_calls[backend.name] >= self.slow_strikes:
+                    self.down_until[backend.name] = time.time() + self.retry_after
+                    self.slow_calls[backend.name] = 0
+            except RecognizerUnavailable as e:
+                print(f"⚠️  {e}")
+                self.down_until[backend.name] = time.time() + self.retry_after
+                if last:
+                    raise
+        return None
+
+
+def make_backend(name):
+    name = name.strip().lower()
+    if name == "google":
+        return GoogleRecognizer(language=os.environ.get("RECOGNIZER_LANGUAGE", "ml-IN"))
+    if name == "vosk":
+        return VoskRecognizer(os.environ.get("VOSK_MODEL", "models/vosk-model-ml"))
+    if name == "whisper":
+        return WhisperRecognizer(model_size=os.environ.get("WHISPER_MODEL", "base"))
+    raise ValueError(f"Unknown recognizer backend: {name}")
+
+
+def make_recognizer(config="google"):
+    """Build a recognizer from a comma-separated preference list, e.g. "google,vosk"
+
+    Local backends that cannot load (package or model missing) are left out with a warning.
+    """
+    backends = []
+    for name in config.split(","):
+        try:
+            backends.append(make_backend(name))
+        except RecognizerUnavailable as e:
+            print(f"⚠️  Skipping {name.strip()} recognizer: {e}")
+    if not backends:
+        raise RecognizerUnavailable(f"No usable recognizer in '{config}'")
+    print(f"🗣️ Speech recognizers: {', '.join(backend.name for backend in backends)}")
+    if len(backends) == 1:
+        return backends[0]
+    return FallbackRecognizer(backends)
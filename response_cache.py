@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import random
+import atexit
+import threading
+import unicodedata
+from collections import OrderedDict
+
+# Old-style chillu (consonant + virama + ZWJ) -> atomic chillu letters
+CHILLU_FORMS = {
+    "\u0d23\u0d4d\u200d": "\u0d7a",  # ണ്‍ -> ൺ
+    "\u0d28\u0d4d\u200d": "\u0d7b",  # ന്‍ -> ൻ
+    "\u0d30\u0d4d\u200d": "\u0d7c",  # ര്‍ -> ർ
+    "\u0d32\u0d4d\u200d": "\u0d7d",  # ല്‍ -> ൽ
+    "\u0d33\u0d4d\u200d": "\u0d7e",  # ള്‍ -> ൾ
+    "\u0d15\u0d4d\u200d": "\u0d7f",  # ക്‍ -> ൿ
+}
+
+
+def normalize_utterance(text):
+    """Cache key for an utterance: NFC, atomic chillus, no joiners, no punctuation, single spaces, lowercase"""
+    text = unicodedata.normalize("NFC", text)
+    for old, new in CHILLU_FORMS.items():
+        text = text.replace(old, new)
+    text = text.replace("\u200c", "").replace("\u200d", "")  # ZWNJ / ZWJ
+    folded = "".join(
+        " " if unicodedata.category(char)[0] in "PSZ" else char
+        for char in text.lower()
+    )
+    return " ".join(folded.split())
+
+
+class ResponseCache:
+    """LRU + TTL cache of Gemini replies keyed on the normalized utterance, persisted as JSON
+
+    Each key keeps a few reply variants. Once a key has `min_variants`, lookups are served
+    locally (never the same variant twice in a row); now and then (`refresh_rate`) a lookup
+    misses on purpose so a fresh roast is fetched and added to the pool.
+    """
+
+    def __init__(self, path="response_cache.json", max_entries=500, ttl=7 * 24 * 3600,
+                 max_variants=4, min_variants=2, refresh_rate=0.2, save_interval=30):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_variants = max_variants
+        self.min_variants = min_variants
+        self.refresh_rate = refresh_rate
+        self.save_interval = save_interval
+
+        self.entries = OrderedDict()  # key -> {"variants": [[reply, created], ...], "last": index}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.last_save = time.time()
+        self.hits = 0
+        self.misses = 0
+
+        self.load()
+        atexit.register(self.save)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = OrderedDict(json.load(f))
+            print(f"💾 Loaded {len(self.entries)} cached replies from {self.path}")
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load response cache: {e}")
+
+    def save(self):
+        """Write the cache to disk (atomically) if anything changed"""
+        with self.lock:
+            if not self.dirty or not self.path:
+                return
+            data = json.dumps(self.entries, ensure_ascii=False)
+            self.dirty = False
+            self.last_save = time.time()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def get(self, text):
+        """A cached reply for this utterance, or None if Gemini should be asked"""
+        key = normalize_utterance(text)
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry["variants"] = [v for v in entry["variants"] if now - v[1] < self.ttl]
+                if not entry["variants"]:
+                    del self.entries[key]
+                    entry = None
+
+            if entry is None or len(entry["variants"]) < self.min_variants or random.random() < self.refresh_rate:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            choices = [i for i in range(len(entry["variants"])) if i != entry.get("last")]
+            index = random.choice(choices)
+            entry["last"] = index
+            self.hits += 1
+            return entry["variants"][index][0]
+
+    def recent_replies(self, limit=20):
+        """Reply variants of the most recently used keys, newest first"""
+        with self.lock:
+            replies = []
+            for entry in reversed(self.entries.values()):
+                replies.extend(variant[0] for variant in entry["variants"])
+                if len(replies) >= limit:
+                    break
+            return replies[:limit]
+
+    def put(self, text, reply):
+        """Remember a reply variant for this utterance"""
+        key = normalize_utterance(text)
+        if not key or not reply:
+            return
+        with self.lock:
+            entry = self.entries.pop(key, {"variants": [], "last": None})
+            if all(reply != variant[0] for variant in entry["variants"]):
+                entry["variants"].append([reply, time.time()])
+                entry["variants"] = entry["variants"][-self.max_variants:]
+                entry["last"] = None
+            self.entries[key] = entry  # Most recently used goes last
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+            save_due = time.time() - self.last_save > self.save_interval
+        if save_due:
+            self.save()
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+class HandROITracker:
+    """Predict where the hands will be next frame so inference can run on crops only
+
+    Boxes come from the previous frame's landmarks, padded by hand size and by how fast
+    the hand is moving. A full-frame search runs every `full_search_interval` frames
+    (to pick up new hands) and whenever a tracked hand is lost.
+    """
+
+    def __init__(self, padding=0.3, motion_padding=2.0, full_search_interval=15, min_size=96):
+        self.padding = padding  # Extra margin, fraction of hand box size
+        self.motion_padding = motion_padding  # Extra margin, multiples of last frame's movement
+        self.full_search_interval = full_search_interval
+        self.min_size = min_size  # Smallest crop side in pixels
+        self.boxes = []  # Last hand boxes in pixels: (x0, y0, x1, y1)
+        self.velocities = []  # Per box center movement in pixels/frame
+        self.frames_since_full = 0
+        self.lost = True
+        self.last_regions = None  # Regions used for the latest frame (None = full frame)
+
+    def rescale(self, ratio):
+        """Boxes are pixels: follow a change of processing width"""
+        self.boxes = [tuple(value * ratio for value in box) for box in self.boxes]
+        self.velocities = [(vx * ratio, vy * ratio) for vx, vy in self.velocities]
+
+    def plan(self, frame_shape):
+        """Regions to run inference on, or None for a full-frame search"""
+        self.frames_since_full += 1
+        if self.lost or not self.boxes or self.frames_since_full >= self.full_search_interval:
+            self.frames_since_full = 0
+            self.last_regions = None
+            return None
+
+        h, w = frame_shape[:2]
+        regions = []
+        for (x0, y0, x1, y1), (vx, vy) in zip(self.boxes, self.velocities):
+            size = max(x1 - x0, y1 - y0)
+            pad_x = self.padding * size + self.motion_padding * abs(vx)
+            pad_y = self.padding * size + self.motion_padding * abs(vy)
+            # Shift the box along the motion so the hand stays inside
+            cx, cy = (x0 + x1) / 2 + vx, (y0 + y1) / 2 + vy
+            half_w = max((x1 - x0) / 2 + pad_x, self.min_size / 2)
+            half_h = max((y1 - y0) / 2 + pad_y, self.min_size / 2)
+            regions.append((
+                max(0, int(cx - half_w)), max(0, int(cy - half_h)),
+                min(w, int(cx + half_w)), min(h, int(cy + half_h))
+            ))
+
+        self.last_regions = self.merge_overlapping(regions)
+        return self.last_regions
+
+    def merge_overlapping(self, regions):
+        """Union overlapping regions so a hand is never processed twice"""
+        merged = []
+        for region in sorted(regions):
+            if merged and region[0] < merged[-1][2] and region[1] < merged[-1][3] and region[3] > merged[-1][1]:
+                last = merged[-1]
+                merged[-1] = (min(last[0], region[0]), min(last[1], region[1]),
+                              max(last[2], region[2]), max(last[3], region[3]))
+            else:
+                merged.append(region)
+        return merged
+
+    def update(self, hand_points, frame_shape):
+        """Feed the full-frame normalized (hands, 21, 3) landmarks found this frame"""
+        h, w = frame_shape[:2]
+        searched_full = self.last_regions is None
+        # Lost if the crops found fewer hands than we were tracking
+        self.lost = len(hand_points) == 0 or (not searched_full and len(hand_points) < len(self.boxes))
+
+        boxes = []
+        velocities = []
+        for points in hand_points:
+            xs, ys = points[:, 0] * w, points[:, 1] * h
+            box = (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+            center = np.array([(box[0] + box[2]) / 2, (box[1] + box[3]) / 2])
+
+            # Velocity from the nearest box of the previous frame
+            velocity = (0.0, 0.0)
+            if self.boxes:
+                previous = np.array([((b[0] + b[2]) / 2, (b[1] + b[3]) / 2) for b in self.boxes])
+                nearest = previous[np.argmin(np.linalg.norm(previous - center, axis=1))]
+                velocity = tuple(center - nearest)
+
+            boxes.append(box)
+            velocities.append(velocity)
+
+        self.boxes = boxes
+        self.velocities = velocities
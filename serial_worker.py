@@ -0,0 +1,228 @@
+import time
+import threading
+from collections import deque
+import serial
+from arduino_discovery import discover_arduino, wait_for_banner
+from oled_protocol import (FrameDecoder, emotion_frame, baud_frame, ping_frame, RSP_READY, RSP_BAUD_OK,
+                           RSP_ACK, RSP_ERROR, CMD_PING, DEFAULT_BAUD, BAUD_CONFIRM_MS)
+
+READY_LINE = "Ready"  # Printed by oled2.ino once a text command has finished
+
+
+class SerialWorker:
+    """Owns the Arduino serial port: all writes and reads happen on its own threads
+
+    Callers never touch the UART. send() queues a command (bounded, oldest dropped);
+    send_emotion() only keeps the latest emotion, so a burst while the OLED is busy
+    animating collapses into one command. A command is written once the sketch has
+    reported ready for the previous one (or after `ack_timeout` for old sketches).
+    Text lines from the sketch are passed to on_line callbacks from the reader thread.
+
+    With binary=True commands are oled_protocol frames, and after boot the worker asks
+    the sketch to switch to `fast_baud`, falling back to baud_rate if that fails.
+
+    port=None discovers the board (arduino_discovery) on the worker thread.
+    """
+
+    def __init__(self, port, baud_rate=DEFAULT_BAUD, max_queue=8, ack_timeout=5.0, boot_delay=3.0,
+                 binary=True, fast_baud=None):
+        self.port = port
+        self.baud_rate = baud_rate
+        self.max_queue = max_queue
+        self.ack_timeout = ack_timeout
+        self.boot_delay = boot_delay  # Longest wait for the boot banner (opening the port resets the Arduino)
+        self.binary = binary
+        self.fast_baud = fast_baud
+
+        self.serial = None
+        self.queue = deque()
+        self.pending_emotion = None
+        self.condition = threading.Condition()
+        self.busy_since = None  # Time the last command was written, None once acked
+        self.running = False
+        self.connected = threading.Event()
+        self.failed = threading.Event()
+        self.callbacks = []
+        self.threads = []
+        self.decoder = FrameDecoder()
+        self.baud_ok = threading.Event()
+        self.ping_ok = threading.Event()
+
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.acks = 0
+
+    def start(self):
+        self.running = True
+        writer = threading.Thread(target=self.write_loop, name="serial-writer", daemon=True)
+        writer.start()
+        self.threads = [writer]
+        return self
+
+    def wait_connected(self, timeout=None):
+        """Block until the port is open (True) or failed to open (False)"""
+        deadline = None if timeout is None else time.time() + timeout
+        while not self.connected.is_set() and not self.failed.is_set():
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                break
+            self.connected.wait(0.05 if remaining is None else min(0.05, remaining))
+        return self.connected.is_set()
+
+    def on_line(self, callback):
+        self.callbacks.append(callback)
+
+    def send(self, command):
+        """Queue a command (text like "3" or an encoded frame), returns immediately"""
+        with self.condition:
+            if len(self.queue) >= self.max_queue:
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append(command)
+            self.condition.notify()
+
+    def send_emotion(self, emotion_code, speed=100, loops=0):
+        """Show an emotion; replaces any emotion that has not been written yet"""
+        with self.condition:
+            if self.pending_emotion is not None:
+                self.coalesced += 1
+            self.pending_emotion = (emotion_code, speed, loops)
+            self.condition.notify()
+
+    def encode(self, command):
+        if isinstance(command, bytes):
+            return command
+        if isinstance(command, tuple):
+            emotion_code, speed, loops = command
+            if self.binary:
+                return emotion_frame(emotion_code, speed, loops)
+            command = emotion_code
+        return f"{command}\n".encode()
+
+    def close(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join(timeout=1)
+        if self.serial is not None:
+            self.serial.close()
+            self.serial = None
+
+    def open(self):
+        if self.port is None:
+            # Discovery hands over the port already open and booted
+            self.port, self.serial = discover_arduino(self.baud_rate, self.boot_delay)
+            if self.serial is None:
+                print("❌ Arduino connection failed: no board found")
+                self.failed.set()
+                return False
+            self.serial.timeout = 0.2
+        else:
+            try:
+                self.serial = serial.Serial(self.port, self.baud_rate, timeout=0.2)
+            except (serial.SerialException, OSError) as e:
+                print(f"❌ Arduino connection failed: {e}")
+                self.failed.set()
+                return False
+            wait_for_banner(self.serial, self.boot_delay)
+        self.serial.reset_input_buffer()
+        reader = threading.Thread(target=self.read_loop, name="serial-reader", daemon=True)
+        reader.start()
+        self.threads.append(reader)
+        if self.binary and self.fast_baud and self.fast_baud != self.baud_rate:
+            self.negotiate_baud(self.fast_baud)
+        print(f"✅ Connected to Arduino on {self.port} at {self.serial.baudrate} baud")
+        self.connected.set()
+        return True
+
+    def negotiate_baud(self, baud, timeout=0.5):
+        """Ask the sketch to switch rates; keep the old rate if it does not confirm at the new one"""
+        self.baud_ok.clear()
+        self.serial.write(baud_frame(baud))
+        if not self.baud_ok.wait(timeout):
+            print(f"⚠️  Arduino did not accept {baud} baud, staying at {self.serial.baudrate}")
+            return False
+        switched_at = time.time()
+        old_baud = self.serial.baudrate
+        self.serial.baudrate = baud
+        self.ping_ok.clear()
+        self.serial.write(ping_frame())
+        if self.ping_ok.wait(timeout):
+            return True
+        # The sketch falls back to the default rate on its own when no ping arrives; nothing
+        # may be sent at the old rate before it has (it would still be listening at `baud`)
+        print(f"⚠️  No reply at {baud} baud, back to {old_baud}")
+        time.sleep(max(0.0, switched_at + BAUD_CONFIRM_MS / 1000.0 + 0.1 - time.time()))
+        self.serial.baudrate = old_baud
+        return False
+
+    def next_command(self):
+        """Wait until the sketch is free and something is queued; None when closing"""
+        with self.condition:
+            while self.running:
+                if self.busy_since is not None and time.time() - self.busy_since > self.ack_timeout:
+                    self.busy_since = None  # No ack (older sketch), assume it is free again
+                if self.busy_since is None:
+                    if self.queue:
+                        command = self.queue.popleft()
+                    elif self.pending_emotion is not None:
+                        command, self.pending_emotion = self.pending_emotion, None
+                    else:
+                        command = None
+                    if command is not None:
+                        self.busy_since = time.time()
+                        return command
+                self.condition.wait(0.1)
+            return None
+
+    def write_loop(self):
+        if not self.open():
+            return
+        while True:
+            command = self.next_command()
+            if command is None:
+                break
+            try:
+                self.serial.write(self.encode(command))
+                self.sent += 1
+            except (serial.SerialException, OSError) as e:
+                print(f"❌ Failed to send to Arduino: {e}")
+                with self.condition:
+                    self.busy_since = None
+
+    def read_loop(self):
+        while self.running and self.serial is not None:
+            try:
+                data = self.serial.read(self.serial.in_waiting or 1)
+            except (serial.SerialException, OSError, TypeError):
+                break
+            for item in self.decoder.feed(data):
+                if isinstance(item, str):
+                    self.handle_line(item)
+                else:
+                    self.handle_frame(item)
+
+    def handle_line(self, line):
+        if line == READY_LINE:
+            self.mark_ready()
+        for callback in self.callbacks:
+            callback(line)
+
+    def handle_frame(self, frame):
+        if frame.command == RSP_READY:
+            self.mark_ready()
+        elif frame.command == RSP_BAUD_OK:
+            self.baud_ok.set()
+        elif frame.command == RSP_ACK and frame.payload[:1] == bytes([CMD_PING]):
+            self.ping_ok.set()
+        elif frame.command == RSP_ERROR:
+            print(f"⚠️  Arduino rejected command {frame.payload.hex()}")
+            self.mark_ready()
+
+    def mark_ready(self):
+        with self.condition:
+            self.acks += 1
+            self.busy_since = None
+            self.condition.notify()
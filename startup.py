@@ -0,0 +1,99 @@
+import time
+import threading
+import importlib
+import concurrent.futures
+
+STARTED = time.time()  # Import this module first so the timeline includes the other imports
+
+
+class Startup:
+    """Runs independent startup phases in parallel and keeps a timeline of them
+
+    run() starts a phase on a worker thread and returns its future; mark() records a
+    milestone such as "listening". report() prints when every phase started and how long
+    it took, relative to STARTED.
+    """
+
+    def __init__(self, max_workers=6, origin=STARTED):
+        self.origin = origin
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self.phases = {}  # name -> {"start", "end", "ok", "future"}
+        self.milestones = {}  # name -> seconds since origin
+        self.lock = threading.Lock()
+        self.record("imports", origin, time.time(), True)
+
+    def record(self, name, start, end, ok):
+        with self.lock:
+            phase = self.phases.setdefault(name, {"future": None})
+            phase.update(start=start - self.origin, end=end - self.origin, ok=ok)
+
+    def run(self, name, func, *args, **kwargs):
+        """Start a phase in the background, returns its future"""
+        def timed():
+            start = time.time()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.record(name, start, time.time(), False)
+                print(f"⚠️  Startup phase '{name}' failed: {e}")
+                raise
+            self.record(name, start, time.time(), result is not False)
+            return result
+
+        with self.lock:
+            phase = self.phases[name] = {"start": time.time() - self.origin, "end": None, "ok": None, "future": None}
+            phase["future"] = self.executor.submit(timed)
+        return phase["future"]
+
+    def future(self, name):
+        return self.phases[name]["future"]
+
+    def result(self, name, timeout=None):
+        """Wait for a phase and return its result (re-raises its exception)"""
+        return self.future(name).result(timeout)
+
+    def mark(self, name):
+        self.milestones[name] = time.time() - self.origin
+        print(f"⏱️  {name} at {self.milestones[name]:.2f}s")
+
+    def wait_all(self, timeout=None):
+        futures = [phase["future"] for phase in self.phases.values() if phase["future"] is not None]
+        concurrent.futures.wait(futures, timeout)
+
+    def timeline(self):
+        with self.lock:
+            rows = [(phase["start"], name, phase) for name, phase in self.phases.items()]
+        return [
+            {"phase": name, "start": round(start, 3),
+             "duration": None if phase["end"] is None else round(phase["end"] - start, 3), "ok": phase["ok"]}
+            for start, name, phase in sorted(rows)
+        ]
+
+    def report(self, width=40):
+        """Print the startup timeline as a small Gantt chart"""
+        rows = self.timeline()
+        total = max([row["start"] + (row["duration"] or 0) for row in rows] + list(self.milestones.values()) + [0.001])
+        print("🚀 Startup timeline")
+        for row in rows:
+            duration = row["duration"] or 0
+            offset = int(row["start"] / total * width)
+            length = max(1, int(duration / total * width))
+            status = "…" if row["duration"] is None else ("✅" if row["ok"] else "❌")
+            print(f"   {row['phase']:<16} {row['start']:6.2f}s +{duration:5.2f}s {status} |{' ' * offset}{'█' * length}")
+        for name, at in sorted(self.milestones.items(), key=lambda item: item[1]):
+            print(f"   ⏱️  {name:<13} {at:6.2f}s")
+
+    def report_when_done(self, timeout=60):
+        """Print the timeline from a background thread once every phase has finished"""
+        def wait_and_report():
+            self.wait_all(timeout)
+            self.report()
+
+        threading.Thread(target=wait_and_report, name="startup-report", daemon=True).start()
+
+
+def warm_imports(*modules):
+    """Import heavy modules ahead of first use (e.g. cv2/mediapipe before the camera is asked for)"""
+    for module in modules:
+        importlib.import_module(module)
+    return True
@@ -0,0 +1,91 @@
+import os
+import uuid
+import glob
+import asyncio
+import hashlib
+import threading
+import edge_tts
+
+
+class TTSCache:
+    """Content-addressed store of synthesized speech: one MP3 per (text, voice, rate, pitch)
+
+    Files are written to a unique temp name and renamed into place, so concurrent speakers
+    never overwrite each other's audio. The directory is kept under `max_bytes` by deleting
+    the least recently used files.
+    """
+
+    def __init__(self, directory="tts_cache", max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, text, voice, rate, pitch):
+        key = hashlib.sha256(f"{voice}|{rate}|{pitch}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def lookup(self, text, voice, rate, pitch):
+        """Cached file for this utterance, or None"""
+        path = self.path_for(text, voice, rate, pitch)
+        if os.path.exists(path):
+            os.utime(path)  # Mark as recently used
+            self.hits += 1
+            return path
+        return None
+
+    async def synthesize(self, text, voice, rate="+0%", pitch="+0Hz"):
+        """Path to an MP3 of this text, synthesized with edge_tts only on a cache miss"""
+        path = self.lookup(text, voice, rate, pitch)
+        if path:
+            return path
+
+        self.misses += 1
+        path = self.path_for(text, voice, rate, pitch)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            communicate = edge_tts.Communicate(text, voice=voice, rate=rate, pitch=pitch)
+            await communicate.save(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+        return path
+
+    def evict(self):
+        """Delete least recently used files until the cache fits in max_bytes"""
+        with self.lock:
+            files = []
+            for path in glob.glob(os.path.join(self.directory, "*.mp3")):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    async def warm_up(self, phrases, voice, rate="+0%", pitch="+0Hz", concurrency=3):
+        """Pre-synthesize phrases that are not cached yet, a few at a time"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def synthesize_one(text):
+            async with semaphore:
+                try:
+                    await self.synthesize(text, voice, rate, pitch)
+                except Exception as e:
+                    print(f"⚠️  TTS warm-up failed for '{text}': {e}")
+
+        missing = [text for text in phrases if not os.path.exists(self.path_for(text, voice, rate, pitch))]
+        await asyncio.gather(*(synthesize_one(text) for text in missing))
+        print(f"🔥 TTS warm-up: {len(missing)} synthesized, {len(phrases) - len(missing)} already cached")
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import concurrent.futures
+from audio_player import get_player
+
+
+class Utterance:
+    """Handle for one submitted sentence: wait() for it to be spoken, cancel() to drop it"""
+
+    def __init__(self, text, voice, rate, pitch, channel):
+        self.text = text
+        self.voice = voice
+        self.rate = rate
+        self.pitch = pitch
+        self.channel = channel
+        self.future = concurrent.futures.Future()  # Resolves to the audio file once played
+        self.task = None  # Synthesis task on the service loop
+        self.playback = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.playback is not None:
+            self.playback.stop()
+        self.future.cancel()
+
+    def wait(self, timeout=None):
+        """Block until spoken (returns the audio file) or cancelled (returns None)"""
+        try:
+            return self.future.result(timeout)
+        except concurrent.futures.CancelledError:
+            return None
+
+    def done(self):
+        return self.future.done()
+
+
+class TTSService:
+    """Long-lived text-to-speech worker with its own event loop thread
+
+    submit() returns immediately. Utterances are synthesized ahead (up to `lookahead` at a
+    time, through the TTS cache) on one persistent loop and played strictly in submission
+    order, so the next sentence is usually ready before the current one finishes.
+    """
+
+    def __init__(self, cache, lookahead=2):
+        self.cache = cache
+        self.lookahead = lookahead
+        self.loop = None
+        self.thread = None
+        self.queue = None
+        self.semaphore = None
+        self.pending = []  # Utterances submitted but not finished, in order
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+
+    def start(self):
+        if self.thread is not None:
+            return self
+        self.thread = threading.Thread(target=self.run_loop, name="tts-service", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        return self
+
+    def run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.queue = asyncio.Queue()
+        self.semaphore = asyncio.Semaphore(self.lookahead)
+        self.loop.create_task(self.playback_worker())
+        self.ready.set()
+        self.loop.run_forever()
+
+    def submit(self, text, voice, rate="+0%", pitch="+0Hz", channel="speech"):
+        """Queue a sentence to be spoken, returns its Utterance without waiting"""
+        if self.thread is None:
+            self.start()
+        utterance = Utterance(text, voice, rate, pitch, channel)
+        with self.lock:
+            self.pending.append(utterance)
+        self.loop.call_soon_threadsafe(self.enqueue, utterance)
+        return utterance
+
+    def synthesize(self, text, voice, rate="+0%", pitch="+0Hz"):
+        """Synthesize only (no playback) on the service loop, returns a concurrent Future of the file"""
+        if self.thread is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(self.cache.synthesize(text, voice, rate, pitch), self.loop)
+
+    def warm_up(self, phrases, voice, rate="+0%", pitch="+0Hz"):
+        """Pre-synthesize phrases in the background, returns a concurrent Future"""
+        if self.thread is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(self.cache.warm_up(phrases, voice, rate, pitch), self.loop)
+
+    def cancel_all(self):
+        """Drop everything queued and stop the sentence being spoken"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        for utterance in pending:
+            utterance.cancel()
+            if utterance.task is not None:
+                self.loop.call_soon_threadsafe(utterance.task.cancel)
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.cancel_all()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2)
+        self.thread = None
+
+    def enqueue(self, utterance):
+        """Runs on the service loop: start synthesis right away, play in order later"""
+        if utterance.cancelled:
+            return
+        utterance.task = self.loop.create_task(self.synthesize_ahead(utterance))
+        self.queue.put_nowait(utterance)
+
+    async def synthesize_ahead(self, utterance):
+        async with self.semaphore:
+            return await self.cache.synthesize(utterance.text, utterance.voice, utterance.rate, utterance.pitch)
+
+    async def playback_worker(self):
+        while True:
+            utterance = await self.queue.get()
+            try:
+                filename = await utterance.task
+                if utterance.cancelled:
+                    continue
+                utterance.playback = get_player().play(filename, channel=utterance.channel)
+                await self.loop.run_in_executor(None, utterance.playback.wait)
+                if not utterance.future.done():
+                    utterance.future.set_result(filename)
+            except asyncio.CancelledError:
+                utterance.future.cancel()
+            except Exception as e:
+                print(f"❌ TTS error for '{utterance.text}': {e}")
+                if not utterance.future.done():
+                    utterance.future.set_exception(e)
+            finally:
+                with self.lock:
+                    if utterance in self.pending:
+                        self.pending.remove(utterance)
+
+
+service = None
+service_lock = threading.Lock()
+
+
+def get_tts_service():
+    """Shared TTSService using the shared TTS cache, started on first use"""
+    global service
+    if service is None:
+        with service_lock:
+            if service is None:
+                from malayalam_tts import tts_cache
+                service = TTSService(tts_cache).start()
+    return service
@@ -0,0 +1,258 @@
+import threading
+from collections import deque
+import numpy as np
+import pyaudio
+import speech_recognition as sr
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30  # VAD decision granularity
+
+
+def frame_features(samples):
+    """RMS energy and zero-crossing rate (crossings per sample) of one int16 frame"""
+    samples = samples.astype(np.float32)
+    energy = float(np.sqrt(np.mean(samples * samples)))
+    signs = np.signbit(samples)
+    zcr = float(np.count_nonzero(signs[1:] != signs[:-1])) / max(len(samples) - 1, 1)
+    return energy, zcr
+
+
+class VoiceActivityDetector:
+    """Energy + zero-crossing VAD with an adaptive noise floor
+
+    Feed it fixed-size int16 frames; it returns the raw bytes of a finished speech
+    segment (including `pre_roll_ms` of audio before speech started) or None.
+    The noise floor follows the energy of non-speech frames, so fans and traffic
+    raise the threshold instead of triggering the recognizer.
+
+    While the robot is talking, process() also gets the loudspeaker output level. The
+    mic's share of it (`echo_gain`, learned from non-speech frames) is the expected echo,
+    and only frames `echo_ratio` times louder than that count as speech. A segment that
+    overlaps playback is dropped unless it had `start_frames` of such barge-in speech.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS, threshold_ratio=3.0, min_energy=200,
+                 max_zcr=0.35, start_frames=3, hangover_ms=450, pre_roll_ms=300,
+                 min_speech_ms=250, max_segment_s=10, noise_adapt=0.05, calibration_ms=500,
+                 echo_ratio=2.0, echo_gain=2.0, echo_adapt=0.1, echo_tail_ms=300):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.threshold_ratio = threshold_ratio
+        self.min_energy = min_energy
+        self.max_zcr = max_zcr  # Hiss and clicks cross zero far more often than voice
+        self.start_frames = start_frames
+        self.hangover_frames = hangover_ms // frame_ms
+        self.min_speech_frames = min_speech_ms // frame_ms
+        self.max_segment_frames = int(max_segment_s * 1000) // frame_ms
+        self.noise_adapt = noise_adapt
+        self.calibration_frames = calibration_ms // frame_ms
+        self.echo_ratio = echo_ratio
+        self.echo_gain = echo_gain  # Mic energy per unit of output level; starts high and is learned down
+        self.echo_adapt = echo_adapt
+
+        self.noise_floor = None
+        self.pre_roll = deque(maxlen=pre_roll_ms // frame_ms)
+        self.segment = []
+        self.in_speech = False
+        self.voiced_run = 0  # Consecutive speech-like frames before a segment starts
+        self.speech_frames = 0
+        self.silent_run = 0
+        self.frames_seen = 0
+        self.segments = 0
+        self.rejected = 0  # Segments too short to be speech
+        # Output level of the last frames: covers output latency and syllables that just ended
+        self.playback_levels = deque(maxlen=max(echo_tail_ms // frame_ms, 1))
+        self.segment_echo_frames = 0  # Frames of the current segment captured during playback
+        self.barge_in_frames = 0  # ... of which were clearly louder than the echo
+        self.echo_rejected = 0
+
+    @property
+    def frame_samples(self):
+        return self.sample_rate * self.frame_ms // 1000
+
+    @property
+    def threshold(self):
+        return max((self.noise_floor or 0) * self.threshold_ratio, self.min_energy)
+
+    def is_speech(self, energy, zcr, threshold=None):
+        threshold = threshold or self.threshold
+        return energy > threshold and (zcr < self.max_zcr or energy > 2 * threshold)
+
+    def echo_threshold(self, playback):
+        return max(self.threshold, self.echo_gain * playback) * self.echo_ratio
+
+    def update_noise_floor(self, energy):
+        if self.noise_floor is None:
+            self.noise_floor = energy
+        else:
+            self.noise_floor += self.noise_adapt * (energy - self.noise_floor)
+
+    def process(self, frame, playback_level=0.0):
+        """Feed one frame (bytes), returns a finished speech segment (bytes) or None
+
+        playback_level: RMS of what the loudspeaker is playing right now (0 when silent)
+        """
+        energy, zcr = frame_features(np.frombuffer(frame, dtype=np.int16))
+        self.frames_seen += 1
+        self.playback_levels.append(playback_level)
+        playback = max(self.playback_levels)
+
+        # First half second is assumed to be background noise
+        if self.frames_seen <= self.calibration_frames:
+            self.update_noise_floor(energy)
+            self.pre_roll.append(frame)
+            return None
+
+        if playback:
+            speech = self.is_speech(energy, zcr, self.echo_threshold(playback))
+            if not speech:
+                self.echo_gain += self.echo_adapt * (energy / playback - self.echo_gain)
+        else:
+            speech = self.is_speech(energy, zcr)
+        if not self.in_speech:
+            if not speech:
+                if not playback:
+                    self.update_noise_floor(energy)
+                self.voiced_run = 0
+                self.pre_roll.append(frame)
+                return None
+            self.voiced_run += 1
+            self.pre_roll.append(frame)
+            if self.voiced_run < self.start_frames:
+                return None
+            # Speech started: keep the lead-in so the first syllable is not clipped
+            self.in_speech = True
+            self.segment = list(self.pre_roll)
+            self.pre_roll.clear()
+            self.speech_frames = self.voiced_run
+            self.silent_run = 0
+            self.segment_echo_frames = self.barge_in_frames = self.voiced_run if playback else 0
+            return None
+
+        self.segment.append(frame)
+        if playback:
+            self.segment_echo_frames += 1
+            self.barge_in_frames += speech
+        if speech:
+            self.speech_frames += 1
+            self.silent_run = 0
+        else:
+            self.silent_run += 1
+
+        if self.silent_run >= self.hangover_frames or len(self.segment) >= self.max_segment_frames:
+            return self.finish_segment()
+        return None
+
+    def finish_segment(self):
+        segment, self.segment = self.segment, []
+        self.in_speech = False
+        self.voiced_run = 0
+        if self.speech_frames < self.min_speech_frames:
+            self.rejected += 1
+            return None
+        if self.segment_echo_frames and self.barge_in_frames < self.start_frames:
+            self.echo_rejected += 1  # The robot hearing itself
+            return None
+        self.segments += 1
+        return b"".join(segment)
+
+    def reset(self):
+        self.pre_roll.clear()
+        self.segment = []
+        self.in_speech = False
+        self.voiced_run = 0
+
+
+class VADMicrophone:
+    """Always-open microphone stream that hands only speech segments to on_audio
+
+    The input device is opened once; a reader thread runs every frame through the VAD
+    and calls on_audio(sr.AudioData) per segment, the same contract as
+    Recognizer.listen_in_background.
+
+    With a streaming recognizer, speech frames are also transcribed while they arrive:
+    on_partial(text) sees the growing text and may return True to claim the utterance
+    (the segment then carries `handled_early`); the final text is kept as `transcript`.
+
+    playback_level() reports what the robot itself is playing, so its own voice from the
+    loudspeaker is not heard as a new utterance.
+    """
+
+    def __init__(self, device_index=None, detector=None, stream_recognizer=None, on_partial=None,
+                 playback_level=None):
+        self.device_index = device_index
+        self.detector = detector or VoiceActivityDetector()
+        self.playback_level = playback_level  # Callable, loudspeaker output level (see VoiceActivityDetector)
+        self.stream_recognizer = None
+        self.on_partial = on_partial
+        self.pa = None
+        self.stream = None
+        self.thread = None
+        self.running = False
+        self.set_stream_recognizer(stream_recognizer)
+
+    def set_stream_recognizer(self, recognizer):
+        """Attach a recognizer while already listening (it may still be loading at start()); next frame uses it"""
+        self.stream_recognizer = recognizer if recognizer and recognizer.streaming else None
+
+    def start(self, on_audio):
+        """Open the stream and start listening, returns a stop function"""
+        self.pa = pyaudio.PyAudio()
+        self.stream = self.pa.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.detector.sample_rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.detector.frame_samples,
+        )
+        self.running = True
+        self.thread = threading.Thread(target=self.read_loop, args=(on_audio,), name="vad-microphone", daemon=True)
+        self.thread.start()
+        return self.stop
+
+    def read_loop(self, on_audio):
+        frame_samples = self.detector.frame_samples
+        transcriber = None  # Streaming transcription of the segment in progress
+        handled_early = False
+        while self.running:
+            try:
+                frame = self.stream.read(frame_samples, exception_on_overflow=False)
+            except OSError as e:
+                print(f"❌ Microphone read error: {e}")
+                break
+            segment = self.detector.process(frame, self.playback_level() if self.playback_level else 0.0)
+
+            if self.stream_recognizer and self.detector.in_speech:
+                if transcriber is None:
+                    # Segment just started (or the recognizer just arrived): transcribe what was buffered first
+                    transcriber, handled_early = self.stream_recognizer.start_stream(), False
+                    frames = self.detector.segment
+                else:
+                    frames = [frame]
+                for speech_frame in frames:
+                    partial = transcriber.feed(speech_frame)
+                    if partial and self.on_partial and not handled_early:
+                        handled_early = bool(self.on_partial(partial))
+
+            if segment:
+                audio = sr.AudioData(segment, self.detector.sample_rate, 2)
+                if transcriber is not None:
+                    transcriber.feed(frame)
+                    audio.transcript = transcriber.finish()
+                    audio.handled_early = handled_early
+                on_audio(audio)
+            if not self.detector.in_speech:
+                transcriber = None
+
+    def stop(self, wait_for_stop=True):
+        self.running = False
+        if wait_for_stop and self.thread is not None:
+            self.thread.join(timeout=1)
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        if self.pa is not None:
+            self.pa.terminate()
+            self.pa = None
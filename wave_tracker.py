@@ -0,0 +1,145 @@
+from collections import deque
+import math
+
+
+class SlidingExtrema:
+    """Running min and max over the last `window` samples (monotonic deques, O(1) amortized)"""
+
+    def __init__(self, window):
+        self.window = window
+        self.mins = deque()  # (index, value), values increasing
+        self.maxs = deque()  # (index, value), values decreasing
+
+    def push(self, index, value):
+        while self.mins and self.mins[-1][1] >= value:
+            self.mins.pop()
+        self.mins.append((index, value))
+        while self.maxs and self.maxs[-1][1] <= value:
+            self.maxs.pop()
+        self.maxs.append((index, value))
+
+        oldest = index - self.window
+        while self.mins[0][0] <= oldest:
+            self.mins.popleft()
+        while self.maxs[0][0] <= oldest:
+            self.maxs.popleft()
+
+    def range(self):
+        return self.maxs[0][1] - self.mins[0][1] if self.mins else 0
+
+    def rescale(self, ratio):
+        self.mins = deque((index, value * ratio) for index, value in self.mins)
+        self.maxs = deque((index, value * ratio) for index, value in self.maxs)
+
+
+class HandWaveState:
+    """Wave statistics for one tracked hand, updated one sample at a time"""
+
+    def __init__(self, hand_id, window):
+        self.hand_id = hand_id
+        self.window = window
+        self.samples = 0
+        self.position = None
+        self.missing = 0  # Frames since this hand was last seen
+        self.x_extrema = SlidingExtrema(window)
+        self.y_extrema = SlidingExtrema(window)
+        self.last_moving_right = None
+        # One flag per consecutive pair of x changes inside the window
+        self.flips = deque(maxlen=max(window - 2, 1))
+        self.direction_changes = 0
+
+    def add(self, position):
+        x, y = position
+        if self.position is not None:
+            moving_right = x - self.position[0] > 0
+            if self.last_moving_right is not None:
+                if len(self.flips) == self.flips.maxlen:
+                    self.direction_changes -= self.flips[0]
+                flip = int(moving_right != self.last_moving_right)
+                self.flips.append(flip)
+                self.direction_changes += flip
+            self.last_moving_right = moving_right
+
+        self.x_extrema.push(self.samples, x)
+        self.y_extrema.push(self.samples, y)
+        self.samples += 1
+        self.position = position
+        self.missing = 0
+
+    def rescale(self, ratio):
+        """Positions are pixels: follow a change of processing width"""
+        if self.position is not None:
+            self.position = (self.position[0] * ratio, self.position[1] * ratio)
+        self.x_extrema.rescale(ratio)
+        self.y_extrema.rescale(ratio)
+
+    def x_range(self):
+        return self.x_extrema.range()
+
+    def y_range(self):
+        return self.y_extrema.range()
+
+    def is_wave(self, threshold, min_samples):
+        """Side-to-side motion: wide x range, at least 3 direction changes, more x than y movement"""
+        if min(self.samples, self.window) < min_samples:
+            return False
+        x_range = self.x_range()
+        return (
+            x_range > threshold and
+            self.direction_changes >= 3 and
+            x_range > self.y_range() * 0.7
+        )
+
+
+class WaveTracker:
+    """Keep hand identities across frames (nearest neighbour) and per-hand wave state"""
+
+    def __init__(self, window=15, max_match_distance=150, max_missing=5):
+        self.window = window
+        self.max_match_distance = max_match_distance  # Pixels a hand may move between frames
+        self.max_missing = max_missing
+        self.hands = {}  # hand_id -> HandWaveState
+        self.next_id = 1
+
+    def update(self, positions):
+        """Add this frame's hand centers, returns the HandWaveState for each position, in order"""
+        # Greedy nearest-neighbour matching, closest pairs first
+        pairs = sorted(
+            (math.dist(position, state.position), i, hand_id)
+            for i, position in enumerate(positions)
+            for hand_id, state in self.hands.items()
+        )
+        assigned = [None] * len(positions)
+        used = set()
+        for dist, i, hand_id in pairs:
+            if dist > self.max_match_distance:
+                break
+            if assigned[i] is None and hand_id not in used:
+                assigned[i] = hand_id
+                used.add(hand_id)
+
+        # Hands that were not seen this frame age out
+        for hand_id in list(self.hands):
+            if hand_id not in used:
+                self.hands[hand_id].missing += 1
+                if self.hands[hand_id].missing > self.max_missing:
+                    del self.hands[hand_id]
+
+        states = []
+        for i, position in enumerate(positions):
+            if assigned[i] is None:
+                assigned[i] = self.next_id
+                self.hands[self.next_id] = HandWaveState(self.next_id, self.window)
+                self.next_id += 1
+            state = self.hands[assigned[i]]
+            state.add(position)
+            states.append(state)
+        return states
+
+    def rescale(self, ratio):
+        """Scale every hand's stored positions, e.g. when frames are resized to a new width"""
+        for state in self.hands.values():
+            state.rescale(ratio)
+
+    def reset(self):
+        self.hands.clear()